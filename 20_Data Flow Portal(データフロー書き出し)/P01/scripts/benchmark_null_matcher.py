@@ -0,0 +1,54 @@
+import argparse
+import os
+import sys
+import timeit
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.utils.nulls import NullMatcher
+
+
+NULL_VALUES = ["NULL", "null", "None", ""]
+SAMPLES = ["NULL", "null", " none ", "", "   ", None, "0", "PAID", "2026-02-01", "nullable"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="NULL matcher benchmark")
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args()
+
+
+def legacy_is_null(value, null_values):
+    # 行ごとに NULL 集合を作り直していた旧実装
+    if value is None:
+        return True
+    text = str(value).strip()
+    if text == "":
+        return True
+    return text.lower() in {str(v).lower() for v in null_values}
+
+
+def main():
+    args = parse_args()
+    is_null = NullMatcher(NULL_VALUES).match
+
+    def run_compiled():
+        for value in SAMPLES:
+            is_null(value)
+
+    def run_legacy():
+        for value in SAMPLES:
+            legacy_is_null(value, NULL_VALUES)
+
+    compiled = min(timeit.repeat(run_compiled, number=args.number, repeat=args.repeat))
+    legacy = min(timeit.repeat(run_legacy, number=args.number, repeat=args.repeat))
+    values = args.number * len(SAMPLES)
+    print(f"compiled: {compiled / values * 1e9:.0f} ns/value")
+    print(f"legacy:   {legacy / values * 1e9:.0f} ns/value ({legacy / compiled:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
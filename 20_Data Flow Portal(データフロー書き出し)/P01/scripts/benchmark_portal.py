@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from generate_dummy_csv import build_synthetic_rows, write_rows
+
+from src.config_manager import ConfigManager
+from src.handlers.column_planner import plan_columns
+from src.handlers.context_filler import fill_context
+from src.handlers.csv_loader import load_csv
+from src.handlers.event_aggregator import aggregate_events
+from src.handlers.portal_renderer import PortalRenderer
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Data Flow Portal stage benchmark")
+    parser.add_argument("--config", default=os.path.join(ROOT_DIR, "config", "main.yaml"))
+    parser.add_argument("--input", default=None, help="既存CSVを使う場合に指定")
+    parser.add_argument("--cases", type=int, default=20000)
+    parser.add_argument("--tables", type=int, default=20)
+    parser.add_argument("--attrs", type=int, default=30)
+    parser.add_argument("--change-density", type=float, default=0.3)
+    parser.add_argument("--null-ratio", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default=None, help="結果をJSONで保存")
+    parser.add_argument("--compare", default=None, help="比較対象のJSON（--json の出力）")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    return parser.parse_args()
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            return peak / 1024 / 1024
+        return peak / 1024
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().peak_wset / 1024 / 1024
+
+
+def run_stage(results, name, row_count, func):
+    started = time.perf_counter()
+    value = func()
+    elapsed = time.perf_counter() - started
+    results.append(
+        {
+            "stage": name,
+            "seconds": round(elapsed, 4),
+            "rows_per_sec": round(row_count / elapsed, 1) if elapsed > 0 else None,
+            "peak_rss_mb": peak_rss_mb(),
+        }
+    )
+    return value
+
+
+def run_benchmark(config, input_csv, output_dir):
+    csv_conf = config["csv"]
+    config["paths"]["output_dir"] = output_dir
+    config["paths"]["assets_dir"] = os.path.join(output_dir, "assets")
+    results = []
+
+    rows = run_stage(
+        results, "load_csv", 0, lambda: load_csv(input_csv, csv_conf["required_columns"])
+    )
+    row_count = len(rows)
+    results[-1]["rows_per_sec"] = round(row_count / results[-1]["seconds"], 1)
+    filled = run_stage(
+        results,
+        "fill_context",
+        row_count,
+        lambda: fill_context(
+            rows,
+            csv_conf["carry_forward_columns"],
+            csv_conf["required_columns"],
+        ),
+    )
+    events = run_stage(
+        results,
+        "aggregate_events",
+        row_count,
+        lambda: aggregate_events(filled, csv_conf["null_values"]),
+    )
+    columns = run_stage(
+        results,
+        "plan_columns",
+        row_count,
+        lambda: plan_columns(
+            filled, config["display"].get("priority_columns", []), events.registry
+        ),
+    )
+    run_stage(
+        results,
+        "render",
+        row_count,
+        lambda: PortalRenderer(config).render(events, columns, input_csv),
+    )
+    summary = {"rows": row_count, "events": len(events), "columns": len(columns)}
+    return summary, results
+
+
+def compare(results, baseline_path, tolerance):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {item["stage"]: item for item in json.load(f)["stages"]}
+    regressions = []
+    for item in results:
+        base = baseline.get(item["stage"])
+        if base and item["seconds"] > base["seconds"] * (1 + tolerance):
+            regressions.append(
+                f"{item['stage']}: {base['seconds']:.3f}s -> {item['seconds']:.3f}s"
+            )
+    return regressions
+
+
+def main():
+    args = parse_args()
+    config = ConfigManager(args.config).load()
+    config["display"]["shard_by"] = "none"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_csv = args.input
+        if not input_csv:
+            input_csv = os.path.join(tmp, "synthetic.csv")
+            write_rows(
+                input_csv,
+                build_synthetic_rows(
+                    args.cases,
+                    args.tables,
+                    args.attrs,
+                    args.change_density,
+                    args.null_ratio,
+                    args.seed,
+                ),
+            )
+        summary, results = run_benchmark(config, input_csv, os.path.join(tmp, "portal"))
+
+    print(
+        f"rows: {summary['rows']}  events: {summary['events']}  columns: {summary['columns']}"
+    )
+    print(f"{'stage':<18}{'seconds':>10}{'rows/s':>14}{'peak RSS MiB':>14}")
+    for item in results:
+        rss = item["peak_rss_mb"]
+        print(
+            f"{item['stage']:<18}{item['seconds']:>10.3f}"
+            f"{item['rows_per_sec'] or 0:>14,.0f}"
+            f"{(f'{rss:.1f}' if rss is not None else 'n/a'):>14}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "stages": results}, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        if regressions:
+            print("REGRESSION: " + "; ".join(regressions), file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
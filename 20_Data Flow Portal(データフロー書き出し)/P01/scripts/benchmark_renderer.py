@@ -0,0 +1,71 @@
+import argparse
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from generate_dummy_csv import build_rows
+
+from src.config_manager import ConfigManager
+from src.handlers.column_planner import plan_event_columns
+from src.handlers.context_filler import fill_context
+from src.handlers.event_aggregator import aggregate_events
+from src.handlers.portal_renderer import PortalRenderer
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="PortalRenderer benchmark")
+    parser.add_argument("--config", default=os.path.join(ROOT_DIR, "config", "main.yaml"))
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args()
+
+
+def scale_rows(base_rows, target):
+    rows = []
+    copy_no = 0
+    while len(rows) < target:
+        for row in base_rows:
+            if len(rows) >= target:
+                break
+            scaled = dict(row)
+            scaled["case_id"] = f"{row['case_id']}-{copy_no:05d}"
+            scaled["_line_no"] = len(rows) + 2
+            rows.append(scaled)
+        copy_no += 1
+    return rows
+
+
+def main():
+    args = parse_args()
+    config = ConfigManager(args.config).load()
+    csv_conf = config["csv"]
+
+    rows = fill_context(
+        scale_rows(build_rows(), args.rows),
+        csv_conf["carry_forward_columns"],
+        csv_conf["required_columns"],
+    )
+    events = aggregate_events(rows, csv_conf["null_values"])
+    columns = plan_event_columns(events, config["display"].get("priority_columns", []))
+    renderer = PortalRenderer(config)
+
+    best = None
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        size = 0
+        for chunk in renderer.iter_html(events, columns, "benchmark.csv", "assets/style.css"):
+            size += len(chunk)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    print(f"rows: {len(rows)}  events: {len(events)}  columns: {len(columns)}")
+    print(f"render: {best:.3f}s  {len(events) / best:,.0f} events/s  {len(rows) / best:,.0f} rows/s")
+    print(f"html size: {size / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
+import argparse
 import csv
 import os
+import random
 
 
 def build_rows():
@@ -238,30 +240,106 @@ def build_rows():
     ]
 
 
-def main():
-    output_dir = os.path.join("data", "input")
-    os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(output_dir, "data_flow_dummy.csv")
+HEADERS = [
+    "case_id",
+    "table",
+    "operation",
+    "trigger",
+    "attr_type",
+    "before",
+    "after",
+    "note",
+    "sql",
+]
 
-    rows = build_rows()
-    headers = [
-        "case_id",
-        "table",
-        "operation",
-        "trigger",
-        "attr_type",
-        "before",
-        "after",
-        "note",
-        "sql",
-    ]
+TRIGGERS = ["AdminUI", "BatchJob", "SupportTool", "RefundAPI", "注文確定", "キャンセル"]
+
+
+def build_synthetic_rows(
+    cases,
+    tables,
+    attrs_per_table,
+    change_density=0.3,
+    null_ratio=0.1,
+    seed=0,
+):
+    rng = random.Random(seed)
+    table_names = [f"table{idx:03d}s" for idx in range(tables)]
+    attr_names = {
+        table: [f"{table[:-1]}_attr{idx:03d}" for idx in range(attrs_per_table)]
+        for table in table_names
+    }
+    state = {table: {} for table in table_names}
+
+    for case_no in range(cases):
+        table = rng.choice(table_names)
+        values = state[table]
+        operation = "INSERT" if not values else rng.choice(["UPDATE", "UPDATE", "DELETE"])
+        attrs = [attr for attr in attr_names[table] if rng.random() < change_density]
+        if not attrs:
+            attrs = [rng.choice(attr_names[table])]
+
+        for idx, attr in enumerate(attrs):
+            before = values.get(attr, "NULL")
+            if rng.random() < null_ratio:
+                after = "NULL"
+            else:
+                after = f"V{rng.randrange(1000)}"
+            values[attr] = after
+            first = idx == 0
+            yield {
+                "case_id": f"CASE-{case_no:07d}",
+                "table": table if first else "",
+                "operation": operation if first else "",
+                "trigger": rng.choice(TRIGGERS) if first else "",
+                "attr_type": attr,
+                "before": before,
+                "after": after,
+                "note": "",
+                "sql": f"{operation} {table} ..." if first else "",
+            }
 
+
+def write_rows(output_path, rows):
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    count = 0
     with open(output_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=headers)
+        writer = csv.DictWriter(f, fieldnames=HEADERS)
         writer.writeheader()
-        writer.writerows(rows)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Data Flow Portal dummy CSV generator")
+    parser.add_argument("--output", default=os.path.join("data", "input", "data_flow_dummy.csv"))
+    parser.add_argument("--cases", type=int, default=0, help="0 なら固定のサンプル行を出力")
+    parser.add_argument("--tables", type=int, default=10)
+    parser.add_argument("--attrs", type=int, default=20, help="テーブルあたりの属性数")
+    parser.add_argument("--change-density", type=float, default=0.3)
+    parser.add_argument("--null-ratio", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.cases > 0:
+        rows = build_synthetic_rows(
+            args.cases,
+            args.tables,
+            args.attrs,
+            args.change_density,
+            args.null_ratio,
+            args.seed,
+        )
+    else:
+        rows = build_rows()
 
-    print(f"Generated: {output_path}")
+    count = write_rows(args.output, rows)
+    print(f"Generated: {args.output} ({count} rows)")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,62 @@
+import argparse
+import csv
+import json
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.handlers.event_store import QUERY_COLUMNS, STORE_NAME, list_attrs, open_event_store, query_changes
+from src.utils.errors import UserInputError
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Data Flow Portal event store query")
+    parser.add_argument(
+        "--db",
+        default=os.path.join(ROOT_DIR, "data", "output", "portal", STORE_NAME),
+        help="--store で書き出した SQLite ファイル",
+    )
+    parser.add_argument("--attr", default=None, help="例: orders::order_status")
+    parser.add_argument("--case", default=None)
+    parser.add_argument("--table", default=None)
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--format", choices=("tsv", "csv", "json"), default="tsv")
+    parser.add_argument("--list-attrs", action="store_true", help="列と変更件数の一覧を表示")
+    return parser.parse_args()
+
+
+def write_rows(rows, fmt, out):
+    if fmt == "json":
+        for row in rows:
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+        return
+    writer = csv.writer(out, delimiter="\t" if fmt == "tsv" else ",", lineterminator="\n")
+    writer.writerow(QUERY_COLUMNS)
+    for row in rows:
+        writer.writerow([row[name] for name in QUERY_COLUMNS])
+
+
+def main():
+    args = parse_args()
+    try:
+        conn = open_event_store(args.db)
+    except UserInputError as exc:
+        print(f"[INPUT ERROR] {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        if args.list_attrs:
+            for attr_key, count in list_attrs(conn, args.table):
+                print(f"{attr_key}\t{count}")
+            return
+        rows = query_changes(conn, args.attr, args.case, args.table, args.limit)
+        write_rows(rows, args.format, sys.stdout)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
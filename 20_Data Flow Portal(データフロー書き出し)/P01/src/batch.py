@@ -0,0 +1,118 @@
+import copy
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from src.handlers.portal_renderer import build_css, escape_html, slugify
+from src.pipeline import build_portal
+from src.utils.build_cache import BuildCache
+from src.utils.errors import UserInputError
+from src.utils.fs import ensure_dir, write_text, write_text_if_changed
+from src.utils.log import setup_logger
+
+
+def resolve_batch_inputs(config, pattern=None):
+    if pattern:
+        inputs = sorted(glob.glob(pattern))
+    else:
+        inputs = list(config["display"].get("input_candidates", []))
+    if not inputs:
+        raise UserInputError("バッチ対象の入力CSVがありません")
+    missing = [path for path in inputs if not os.path.exists(path)]
+    if missing:
+        raise UserInputError(f"入力CSVが見つかりません: {', '.join(missing)}")
+    return inputs
+
+
+def plan_batch(inputs):
+    names = {}
+    used = set()
+    for path in inputs:
+        stem = slugify(os.path.splitext(os.path.basename(path))[0])
+        name = stem
+        index = 2
+        while name in used:
+            name = f"{stem}_{index}"
+            index += 1
+        used.add(name)
+        names[path] = name
+    return names
+
+
+def build_batch_config(config, input_csv, output_root, names):
+    item = copy.deepcopy(config)
+    output_dir = os.path.join(output_root, names[input_csv])
+    item["paths"]["input_csv"] = input_csv
+    item["paths"]["output_dir"] = output_dir
+    item["paths"]["assets_dir"] = os.path.join(output_dir, "assets")
+    item["paths"]["shared_assets_dir"] = os.path.join(output_root, "assets")
+    item["display"]["input_candidates"] = list(names)
+    return item
+
+
+def build_input_links(names):
+    return {path: f"../{name}/index.html" for path, name in names.items()}
+
+
+def render_batch_item(config, force, profile, input_links):
+    logger = setup_logger(config["paths"]["log_dir"])
+    return build_portal(config, logger, force, profile, input_links)
+
+
+def render_batch(config, inputs, output_root, logger, workers=None, force=False, profile=False):
+    names = plan_batch(inputs)
+    links = build_input_links(names)
+    ensure_dir(os.path.join(output_root, "assets"))
+    write_text_if_changed(os.path.join(output_root, "assets", "style.css"), build_css())
+
+    configs = [build_batch_config(config, path, output_root, names) for path in inputs]
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            path: pool.submit(render_batch_item, item, force, profile, links)
+            for path, item in zip(inputs, configs)
+        }
+        for path, future in futures.items():
+            results[path] = future.result()
+            logger.info("batch generated: %s", results[path])
+
+    # 通常ビルドの index.html を一覧で上書きするので、次の通常ビルドが「変更なし」と判定しないよう記録を消す
+    BuildCache(output_root).clear()
+    index_path = os.path.join(output_root, "index.html")
+    write_text(index_path, build_batch_index(names))
+    return index_path
+
+
+def build_batch_index(names):
+    generated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    rows = "".join(
+        f"<tr><td><a href='{escape_html(name)}/index.html'>{escape_html(os.path.basename(path))}</a></td>"
+        f"<td>{escape_html(path)}</td></tr>"
+        for path, name in names.items()
+    )
+    return f"""<!DOCTYPE html>
+<html lang="ja">
+<head>
+  <meta charset="utf-8" />
+  <title>Data Flow Portal</title>
+  <link rel="stylesheet" href="assets/style.css">
+</head>
+<body>
+  <div class="portal-container">
+    <h1>Data Flow Portal</h1>
+    <div class="meta">Generated: {generated_at}</div>
+    <div class="table-wrap">
+      <table class="shard-index">
+        <thead>
+          <tr><th>入力CSV</th><th>パス</th></tr>
+        </thead>
+        <tbody>
+          {rows}
+        </tbody>
+      </table>
+    </div>
+  </div>
+</body>
+</html>
+"""
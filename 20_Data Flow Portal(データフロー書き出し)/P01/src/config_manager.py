@@ -1,6 +1,14 @@
+import hashlib
+import json
 import os
 
 from src.utils.errors import UserInputError
+from src.utils.fs import write_text
+
+
+# _validate の内容を変えたら上げる（DEFAULT_CONFIG の変更はハッシュで検知する）
+CONFIG_CACHE_VERSION = "1"
+CONFIG_CACHE_DIR = "data/cache"
 
 
 DEFAULT_CONFIG = {
@@ -24,6 +32,12 @@ DEFAULT_CONFIG = {
         ],
         "carry_forward_columns": ["table", "operation", "trigger", "sql"],
         "null_values": ["NULL", "null", "None", ""],
+        "streaming": False,
+        "row_cache": False,
+        "row_cache_dir": "data/cache",
+        "fill_engine": "python",
+        "parallel_workers": 0,
+        "parallel_chunk_mb": 64,
     },
     "display": {
         "fixed_columns": ["event_id", "table", "operation", "trigger"],
@@ -31,20 +45,88 @@ DEFAULT_CONFIG = {
         "show_generated_at": True,
         "show_input_name": True,
         "show_legend": True,
+        "render_mode": "table",
+        "shard_by": "none",
+        "shard_size": 200,
+        "lineage_page": False,
     },
+    "store": {"enabled": False, "filename": "events.sqlite"},
+    "output": {"compress": [], "size_report": False},
 }
 
 
 class ConfigManager:
-    def __init__(self, config_path):
+    def __init__(self, config_path, cache_dir=None):
         self.config_path = config_path
+        self.cache_dir = cache_dir
 
     def load(self):
+        if not self.cache_dir:
+            return self._load_merged()
+        if not os.path.exists(self.config_path):
+            raise UserInputError(f"config not found: {self.config_path}")
+
+        # マージ・検証済みの設定をJSONで保存し、設定ファイルが同じなら YAML の読込を省く
+        cache_path = self._cache_path()
+        stat = os.stat(self.config_path)
+        cache = self._read_cache(cache_path)
+        if cache and (cache["mtime_ns"], cache["size"]) == (stat.st_mtime_ns, stat.st_size):
+            return cache["config"]
+
+        digest = hash_config_file(self.config_path)
+        if cache and cache["sha256"] == digest:
+            merged = cache["config"]
+        else:
+            merged = self._load_merged()
+        self._write_cache(cache_path, merged, stat, digest)
+        return merged
+
+    def _load_merged(self):
         data = self._load_yaml(self.config_path)
         merged = deep_merge(DEFAULT_CONFIG, data or {})
         self._validate(merged)
         return merged
 
+    def _cache_path(self):
+        path_hash = hashlib.sha256(os.path.abspath(self.config_path).encode("utf-8")).hexdigest()
+        name = os.path.basename(self.config_path)
+        return os.path.join(self.cache_dir, f"{name}.{path_hash[:8]}.config.json")
+
+    def _read_cache(self, cache_path):
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cache, dict):
+            return None
+        if cache.get("version") != CONFIG_CACHE_VERSION or cache.get("defaults") != defaults_hash():
+            return None
+        return cache
+
+    def _write_cache(self, cache_path, merged, stat, digest):
+        try:
+            text = json.dumps(
+                {
+                    "version": CONFIG_CACHE_VERSION,
+                    "defaults": defaults_hash(),
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "sha256": digest,
+                    "config": merged,
+                },
+                ensure_ascii=False,
+            )
+        except (TypeError, ValueError):
+            return
+        # JSON で型が変わる設定（整数キーなど）はキャッシュしない
+        if json.loads(text)["config"] != merged:
+            return
+        try:
+            write_text(cache_path, text)
+        except OSError:
+            pass
+
     def _load_yaml(self, path):
         if not os.path.exists(path):
             raise UserInputError(f"config not found: {path}")
@@ -70,6 +152,17 @@ class ConfigManager:
         if "case_id" not in required_columns or "attr_type" not in required_columns:
             raise UserInputError("csv.required_columns に case_id と attr_type が必要です。")
 
+        if csv_conf.get("fill_engine", "python") not in ("python", "pandas"):
+            raise UserInputError("csv.fill_engine は python / pandas のいずれかを指定してください。")
+
+        workers = csv_conf.get("parallel_workers", 0)
+        if not isinstance(workers, int) or workers < 0:
+            raise UserInputError("csv.parallel_workers は 0 以上の整数で指定してください。")
+
+        compress = config.get("output", {}).get("compress", [])
+        if not isinstance(compress, list) or not set(compress) <= {"gzip", "brotli"}:
+            raise UserInputError("output.compress は gzip / brotli のリストで指定してください。")
+
         fixed_columns = display.get("fixed_columns", [])
         if not fixed_columns:
             raise UserInputError("display.fixed_columns が空です。")
@@ -85,3 +178,13 @@ def deep_merge(base, incoming):
         else:
             merged[key] = value
     return merged
+
+
+def hash_config_file(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def defaults_hash():
+    text = json.dumps(DEFAULT_CONFIG, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
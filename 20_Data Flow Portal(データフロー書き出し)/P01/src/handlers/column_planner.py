@@ -1,23 +1,29 @@
-def plan_columns(rows, priority_columns):
+from src.models import ColumnRegistry
+
+
+def plan_columns(rows, priority_columns, registry=None):
+    if registry is None:
+        registry = ColumnRegistry()
+    intern = registry.intern
     counts = {}
-    order = {}
 
-    for idx, row in enumerate(rows):
-        table = row.get("table", "")
-        attr = build_attr_key(table, row["attr_type"])
-        counts[attr] = counts.get(attr, 0) + 1
-        if attr not in order:
-            order[attr] = idx
+    for row in rows:
+        attr_id = intern(row.get("table", ""), row["attr_type"])
+        counts[attr_id] = counts.get(attr_id, 0) + 1
+
+    return order_columns(counts, priority_columns, registry)
+
 
-    sorted_columns = sorted(
-        counts.keys(),
-        key=lambda col: (-counts[col], order[col]),
-    )
+def plan_event_columns(events, priority_columns):
+    return order_columns(events.column_counts, priority_columns, events.registry)
+
+
+def order_columns(counts, priority_columns, registry):
+    sorted_columns = [
+        registry.key(attr_id)
+        for attr_id in sorted(counts, key=lambda attr_id: -counts[attr_id])
+    ]
 
     priority = [col for col in priority_columns if col in sorted_columns]
     remaining = [col for col in sorted_columns if col not in priority]
     return priority + remaining
-
-
-def build_attr_key(table, attr_type):
-    return f"{table}::{attr_type}"
@@ -2,7 +2,10 @@ from src.utils.errors import UserInputError
 
 
 def fill_context(rows, carry_columns, required_columns):
-    filled = []
+    return list(iter_fill_context(rows, carry_columns, required_columns))
+
+
+def iter_fill_context(rows, carry_columns, required_columns):
     context = {}
     current_case_id = None
 
@@ -28,9 +31,80 @@ def fill_context(rows, carry_columns, required_columns):
             if is_blank(row.get(column, "")):
                 raise UserInputError(f"{column} が欠落しています。", line_no, row)
 
-        filled.append(row)
+        yield row
+
+
+def fill_columns(fieldnames, columns, carry_columns, required_columns):
+    """load_columns の列タプルのまま補完する（csv.fill_engine=pandas）。結果とエラーは fill_context と同じ。"""
+    try:
+        import numpy as np
+        import pandas as pd
+    except ImportError as exc:
+        raise UserInputError(
+            "csv.fill_engine=pandas には pandas が必要です。pip install pandas を実行してください。"
+        ) from exc
+
+    count = len(columns[0]) if columns else 0
+    if not count:
+        return list(columns)
+
+    data = dict(zip(fieldnames, columns))
+    positions = np.arange(count)
+    blank = {}
+    codes = {}
+    for name in dict.fromkeys(["case_id", *carry_columns, *required_columns]):
+        if name in data:
+            values = np.fromiter(data[name], dtype=object, count=count)
+            codes[name], blank[name] = factorize_blank(pd, np, values)
+        else:
+            codes[name] = np.zeros(count, dtype=np.intp)
+            blank[name] = np.ones(count, dtype=bool)
+
+    # case_id が連続する区間の先頭位置。補完はこの区間を越えない（iter_fill_context と同じ）
+    case_codes = codes["case_id"]
+    starts = np.ones(count, dtype=bool)
+    starts[1:] = case_codes[1:] != case_codes[:-1]
+    run_start = np.maximum.accumulate(np.where(starts, positions, 0))
+
+    filled = dict(data)
+    for column in carry_columns:
+        if column not in data:
+            continue
+        last_value = np.maximum.accumulate(np.where(blank[column], -1, positions))
+        fill_at = blank[column] & (last_value >= run_start)
+        targets = np.flatnonzero(fill_at)
+        if len(targets):
+            values = np.fromiter(data[column], dtype=object, count=count)
+            values[targets] = values[last_value[targets]]
+            filled[column] = tuple(values.tolist())
+        blank[column] = blank[column] & ~fill_at
+
+    case_errors = blank["case_id"]
+    failed_at = case_errors.copy()
+    for column in required_columns:
+        failed_at |= blank[column]
+    failed = np.flatnonzero(failed_at)
+    if len(failed):
+        index = int(failed[0])
+        # case_id 欠落は補完前、必須列の欠落は補完後の行で報告する
+        source = data if case_errors[index] else filled
+        row = {name: source[name][index] for name in fieldnames}
+        row["_line_no"] = index + 2
+        if case_errors[index]:
+            raise UserInputError("case_id が欠落しています。", row["_line_no"], row)
+        for column in required_columns:
+            if is_blank(row.get(column, "")):
+                raise UserInputError(f"{column} が欠落しています。", row["_line_no"], row)
+    return [filled[name] for name in fieldnames]
+
 
-    return filled
+def factorize_blank(pd, np, values):
+    codes, uniques = pd.factorize(values)
+    blank_uniques = np.fromiter(
+        (is_blank(value) for value in uniques), dtype=bool, count=len(uniques)
+    )
+    blank = np.append(blank_uniques, True)[codes]
+    return codes, blank
 
 
 def is_blank(value):
@@ -1,24 +1,195 @@
 import csv
+import hashlib
 import os
+import pickle
+import sys
 
 from src.utils.errors import UserInputError
+from src.utils.fs import atomic_open
 
 
-def load_csv(path, required_columns):
+ROW_CACHE_VERSION = "1"
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+
+
+def load_csv(path, required_columns, cache_dir=None):
+    return list(iter_csv(path, required_columns, cache_dir))
+
+
+def iter_csv(path, required_columns, cache_dir=None):
     if not os.path.exists(path):
         raise UserInputError(f"input CSV not found: {path}")
+    if path.lower().endswith(PARQUET_EXTENSIONS):
+        fieldnames, columns = read_parquet_columns(path)
+        validate_header(fieldnames, required_columns)
+        return _iter_columns(fieldnames, columns)
+    if cache_dir:
+        cache_path = row_cache_path(path, cache_dir)
+        cached = read_row_cache(cache_path)
+        if cached is not None:
+            fieldnames, columns = cached
+            validate_header(fieldnames, required_columns)
+            return _iter_columns(fieldnames, columns)
+        return _iter_rows(path, required_columns, cache_path)
+    return _iter_rows(path, required_columns)
+
+
+def load_columns(path, required_columns, cache_dir=None):
+    """列ごとのタプルで読み込む（行 dict は作らない）。ヘッダより列の多い行を含む CSV は None を返す。"""
+    if not os.path.exists(path):
+        raise UserInputError(f"input CSV not found: {path}")
+    if path.lower().endswith(PARQUET_EXTENSIONS):
+        table = read_parquet_columns(path)
+    else:
+        cache_path = row_cache_path(path, cache_dir) if cache_dir else None
+        table = read_row_cache(cache_path) if cache_path else None
+        if table is None:
+            return _read_csv_columns(path, required_columns, cache_path)
+    fieldnames, columns = table
+    validate_header(fieldnames, required_columns)
+    return fieldnames, [tuple(column) for column in columns]
+
 
+def validate_header(fieldnames, required_columns):
+    if not fieldnames:
+        raise UserInputError("CSVヘッダが読み取れません。")
+
+    missing = [col for col in required_columns if col not in fieldnames]
+    if missing:
+        raise UserInputError(f"CSVヘッダ不足: {', '.join(missing)}")
+
+
+def _iter_rows(path, required_columns, cache_path=None):
     with open(path, "r", encoding="utf-8", newline="") as f:
         reader = csv.DictReader(f)
-        if not reader.fieldnames:
-            raise UserInputError("CSVヘッダが読み取れません。")
+        validate_header(reader.fieldnames, required_columns)
 
-        missing = [col for col in required_columns if col not in reader.fieldnames]
-        if missing:
-            raise UserInputError(f"CSVヘッダ不足: {', '.join(missing)}")
-
-        rows = []
+        fieldnames = reader.fieldnames
+        columns = [[] for _ in fieldnames] if cache_path else None
         for idx, row in enumerate(reader, start=2):
+            if columns is not None:
+                if None in row:
+                    columns = None
+                else:
+                    for column, name in zip(columns, fieldnames):
+                        column.append(row[name])
             row["_line_no"] = idx
-            rows.append(row)
-        return rows
+            yield row
+
+    if columns is not None:
+        write_row_cache(cache_path, fieldnames, columns)
+
+
+def _read_csv_columns(path, required_columns, cache_path=None):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        fieldnames = next(reader, None)
+        validate_header(fieldnames, required_columns)
+        # DictReader と同じく空行は飛ばす（行番号はデータ行の通し番号+2 のまま）
+        records = [record for record in reader if record]
+
+    width = len(fieldnames)
+    if any(len(record) != width for record in records):
+        if any(len(record) > width for record in records):
+            return None
+        # 列が足りない行は DictReader と同じく None で埋める
+        records = [record + [None] * (width - len(record)) for record in records]
+    # 文字列だけのタプルは GC の走査対象から外れるので、集約中の GC が軽くなる
+    columns = list(zip(*records)) if records else [() for _ in fieldnames]
+    if cache_path:
+        write_row_cache(cache_path, fieldnames, columns)
+    return fieldnames, columns
+
+
+def _iter_columns(fieldnames, columns):
+    for idx, values in enumerate(zip(*columns), start=2):
+        row = dict(zip(fieldnames, values))
+        row["_line_no"] = idx
+        yield row
+
+
+def row_cache_path(path, cache_dir):
+    stat = os.stat(path)
+    source = "|".join(
+        (
+            ROW_CACHE_VERSION,
+            sys.version.split()[0],
+            str(stat.st_size),
+            str(stat.st_mtime_ns),
+        )
+    )
+    return os.path.join(
+        cache_dir,
+        f"{row_cache_prefix(path)}{hash_text(source)}.rows",
+    )
+
+
+def row_cache_prefix(path):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return f"{name}.{hash_text(os.path.abspath(path))[:8]}."
+
+
+def hash_text(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def read_row_cache(cache_path):
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, "rb") as f:
+            data = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != ROW_CACHE_VERSION:
+        return None
+    return data["fieldnames"], data["columns"]
+
+
+def write_row_cache(cache_path, fieldnames, columns):
+    data = {
+        "version": ROW_CACHE_VERSION,
+        "fieldnames": list(fieldnames),
+        "columns": [intern_values(column) for column in columns],
+    }
+    try:
+        with atomic_open(cache_path, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        return False
+    remove_stale_row_caches(cache_path)
+    return True
+
+
+def remove_stale_row_caches(cache_path):
+    cache_dir = os.path.dirname(cache_path)
+    current = os.path.basename(cache_path)
+    prefix = current[: -len(".rows") - 32]
+    for name in os.listdir(cache_dir):
+        if (
+            name != current
+            and name.startswith(prefix)
+            and name.endswith(".rows")
+            and len(name) == len(current)
+        ):
+            os.remove(os.path.join(cache_dir, name))
+
+
+def intern_values(column):
+    seen = {}
+    return [seen.setdefault(value, value) for value in column]
+
+
+def read_parquet_columns(path):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise UserInputError(
+            "Parquet入力には pyarrow が必要です。pip install pyarrow を実行してください。"
+        ) from exc
+    table = pq.read_table(path)
+    columns = [
+        ["" if value is None else str(value) for value in column.to_pylist()]
+        for column in table.columns
+    ]
+    return list(table.column_names), columns
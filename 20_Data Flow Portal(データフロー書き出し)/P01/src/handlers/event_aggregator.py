@@ -1,54 +1,105 @@
-def aggregate_events(rows, null_values):
-    events = []
+from src.models import Change, Event, EventLog
+from src.utils.nulls import build_null_matcher
+from src.utils.snapshot import Snapshot
+
+
+def aggregate_events(rows, null_values, registry=None):
+    records = (
+        (
+            row["case_id"],
+            row.get("table", ""),
+            row["attr_type"],
+            row.get("before", ""),
+            row.get("after", ""),
+            row.get("note", ""),
+            row,
+        )
+        for row in rows
+    )
+    return aggregate_records(records, row_header, null_values, registry)
+
+
+def aggregate_columns(fieldnames, columns, null_values, registry=None):
+    """load_columns / fill_columns の列タプルから、行 dict を作らずに集約する。"""
+    count = len(columns[0]) if columns else 0
+    data = dict(zip(fieldnames, columns))
+    missing = ("",) * count
+    operation, trigger, sql = (data.get(name, missing) for name in ("operation", "trigger", "sql"))
+    records = zip(
+        data["case_id"],
+        data.get("table", missing),
+        data["attr_type"],
+        data.get("before", missing),
+        data.get("after", missing),
+        data.get("note", missing),
+        range(count),
+    )
+    return aggregate_records(
+        records, lambda index: (operation[index], trigger[index], sql[index]), null_values, registry
+    )
+
+
+def row_header(row):
+    return row.get("operation", ""), row.get("trigger", ""), row.get("sql", "")
+
+
+def aggregate_records(records, header, null_values, registry=None):
+    # records: (case_id, table, attr_type, before, after, note, source)。
+    # operation / trigger / sql はイベントを作るときだけ header(source) で取り出す
+    is_null = build_null_matcher(null_values).match
+    events = EventLog(registry=registry)
+    intern = events.registry.intern
+    column_counts = events.column_counts
     index = {}
-    latest_by_table = {}
+    latest_by_table = events.latest_by_table
+    lineage = events.lineage
+    unsorted = set()
 
-    for row in rows:
-        case_id = row["case_id"]
-        table = row.get("table", "")
-        attr_key = build_attr_key(table, row["attr_type"])
+    for case_id, table, attr_type, before, after, note, source in records:
+        attr_id = intern(table, attr_type)
+        column_counts[attr_id] = column_counts.get(attr_id, 0) + 1
         key = (case_id, table)
-        if key not in index:
-            current_values = dict(latest_by_table.get(table, {}))
-            event = {
-                "case_id": case_id,
-                "table": table,
-                "operation": row.get("operation", ""),
-                "trigger": row.get("trigger", ""),
-                "sql": row.get("sql", ""),
-                "changes": {},
-                "current_values": current_values,
-            }
-            index[key] = event
+        position = index.get(key)
+        if position is None:
+            event = Event(case_id, table, *header(source), Snapshot(latest_by_table.get(table)))
+            position = index[key] = len(events)
             events.append(event)
         else:
-            event = index[key]
-
-        before = row.get("before", "")
-        after = row.get("after", "")
-        event["changes"][attr_key] = {
-            "before": before,
-            "after": after,
-            "note": row.get("note", ""),
-        }
-
-        if is_null(after, null_values):
-            event["current_values"][attr_key] = None
-        else:
-            event["current_values"][attr_key] = after
-        latest_by_table[table] = dict(event["current_values"])
+            event = events[position]
+            if event.current_values.sealed:
+                event.current_values = Snapshot(event.current_values)
 
-    return events
+        if attr_id not in event.changes:
+            positions = lineage.get(attr_id)
+            if positions is None:
+                lineage[attr_id] = [position]
+            else:
+                if position < positions[-1]:
+                    unsorted.add(attr_id)
+                positions.append(position)
+        event.changes[attr_id] = Change(before, after, note)
 
+        current_values = event.current_values
+        if is_null(after):
+            current_values[attr_id] = None
+        else:
+            current_values[attr_id] = after
+        latest_by_table[table] = current_values
 
-def is_null(value, null_values):
-    if value is None:
-        return True
-    text = str(value).strip()
-    if text == "":
-        return True
-    return text.lower() in {str(v).lower() for v in null_values}
+    # 再訪した case の列が後から増えた場合だけ、イベント位置の昇順に並べ直す
+    for attr_id in unsorted:
+        lineage[attr_id].sort()
+    return events
 
 
-def build_attr_key(table, attr_type):
-    return f"{table}::{attr_type}"
+def build_lineage(events):
+    """aggregate_events を通らない EventLog（差分・シャード）向けに列ごとのイベント位置を作り直す。"""
+    lineage = {}
+    for position, event in enumerate(events):
+        for attr_id in event.changes:
+            positions = lineage.get(attr_id)
+            if positions is None:
+                lineage[attr_id] = [position]
+            else:
+                positions.append(position)
+    return lineage
@@ -0,0 +1,76 @@
+from src.models import Change, Event, EventLog
+from src.utils.snapshot import Snapshot
+
+
+def diff_events(base, target):
+    """2つの EventLog を (case_id, table) でハッシュ結合し、before/after が異なる列だけを残す。"""
+    if base.registry is not target.registry:
+        raise ValueError("base and target must share a ColumnRegistry")
+
+    target_index = {(event.case_id, event.table): event for event in target}
+    diff = EventLog(registry=base.registry)
+    matched = set()
+
+    for event in base:
+        key = (event.case_id, event.table)
+        other = target_index.get(key)
+        if other is not None:
+            matched.add(key)
+        append_diff(diff, event, other)
+
+    for event in target:
+        if (event.case_id, event.table) not in matched:
+            append_diff(diff, None, event)
+    return diff
+
+
+def append_diff(diff, base_event, target_event):
+    source = target_event if target_event is not None else base_event
+    base_changes = base_event.changes if base_event is not None else {}
+    target_changes = target_event.changes if target_event is not None else {}
+
+    changes = {}
+    for attr_id, base_change in base_changes.items():
+        target_change = target_changes.get(attr_id)
+        if not same_change(base_change, target_change):
+            changes[attr_id] = build_diff_change(base_change, target_change)
+    for attr_id, target_change in target_changes.items():
+        if attr_id not in base_changes:
+            changes[attr_id] = build_diff_change(None, target_change)
+    if not changes:
+        return None
+
+    event = Event(
+        source.case_id,
+        source.table,
+        source.operation,
+        source.trigger,
+        source.sql,
+        Snapshot(),
+    )
+    event.changes = changes
+    for attr_id in changes:
+        diff.column_counts[attr_id] = diff.column_counts.get(attr_id, 0) + 1
+    diff.append(event)
+    return event
+
+
+def same_change(base_change, target_change):
+    if target_change is None:
+        return False
+    return (base_change.before, base_change.after) == (target_change.before, target_change.after)
+
+
+def build_diff_change(base_change, target_change):
+    # 差分セルは「基準側の after → 比較側の after」として描画する
+    return Change(
+        base_change.after if base_change is not None else "",
+        target_change.after if target_change is not None else "",
+        f"base: {format_pair(base_change)} / target: {format_pair(target_change)}",
+    )
+
+
+def format_pair(change):
+    if change is None:
+        return "-"
+    return f"{change.before} -> {change.after}"
@@ -0,0 +1,181 @@
+import os
+import sqlite3
+from datetime import datetime
+
+from src.models import build_attr_key
+from src.utils.errors import UserInputError
+from src.utils.fs import ensure_dir
+
+
+STORE_NAME = "events.sqlite"
+STORE_VERSION = "1"
+
+SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE attrs (
+    attr_id INTEGER PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    attr_type TEXT NOT NULL,
+    attr_key TEXT NOT NULL
+);
+CREATE TABLE events (
+    event_id INTEGER PRIMARY KEY,
+    case_id TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    operation TEXT,
+    trigger TEXT,
+    sql TEXT
+);
+CREATE TABLE changes (
+    event_id INTEGER NOT NULL,
+    attr_id INTEGER NOT NULL,
+    before TEXT,
+    after TEXT,
+    note TEXT
+);
+"""
+
+INDEXES = """
+CREATE UNIQUE INDEX idx_attrs_key ON attrs (attr_key);
+CREATE INDEX idx_events_case ON events (case_id);
+CREATE INDEX idx_events_table ON events (table_name, case_id);
+CREATE INDEX idx_changes_attr ON changes (attr_id, event_id);
+CREATE INDEX idx_changes_event ON changes (event_id);
+"""
+
+QUERY_COLUMNS = (
+    "event_id",
+    "case_id",
+    "table_name",
+    "operation",
+    "trigger",
+    "attr_key",
+    "before",
+    "after",
+    "note",
+)
+
+
+def store_path(output_dir, filename=None):
+    return os.path.join(output_dir, filename or STORE_NAME)
+
+
+def write_event_store(path, events, input_csv):
+    # 書きかけのDBを読まれないよう、一時ファイルに作ってから置き換える
+    ensure_dir(os.path.dirname(path))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.execute("PRAGMA journal_mode = OFF")
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.executescript(SCHEMA)
+            with conn:
+                insert_rows(conn, events, input_csv)
+            conn.executescript(INDEXES)
+            conn.execute("ANALYZE")
+        finally:
+            conn.close()
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def insert_rows(conn, events, input_csv):
+    conn.executemany(
+        "INSERT INTO meta (key, value) VALUES (?, ?)",
+        [
+            ("version", STORE_VERSION),
+            ("input_csv", input_csv),
+            ("generated_at", datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+        ],
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO attrs (attr_id, table_name, attr_type, attr_key) VALUES (?, ?, ?, ?)",
+        (
+            (attr_id, table, attr_type, build_attr_key(table, attr_type))
+            for attr_id, table, attr_type in events.registry.items()
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO events (event_id, case_id, table_name, operation, trigger, sql) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            (event_id, event.case_id, event.table, event.operation, event.trigger, event.sql)
+            for event_id, event in enumerate(events)
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO changes (event_id, attr_id, before, after, note) VALUES (?, ?, ?, ?, ?)",
+        (
+            (event_id, attr_id, change.before, change.after, change.note)
+            for event_id, event in enumerate(events)
+            for attr_id, change in event.changes.items()
+        ),
+    )
+
+
+def open_event_store(path):
+    if not os.path.exists(path):
+        raise UserInputError(f"event store not found: {path}")
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    except sqlite3.DatabaseError:
+        conn.close()
+        raise UserInputError(f"event store を読み込めません: {path}")
+    if not row or row[0] != STORE_VERSION:
+        conn.close()
+        raise UserInputError(f"event store のバージョンが異なります。再生成してください: {path}")
+    return conn
+
+
+def query_changes(conn, attr_key=None, case_id=None, table=None, limit=None):
+    conditions = []
+    params = []
+    if attr_key:
+        conditions.append("a.attr_key = ?")
+        params.append(attr_key)
+    if case_id:
+        conditions.append("e.case_id = ?")
+        params.append(case_id)
+    if table:
+        conditions.append("e.table_name = ?")
+        params.append(table)
+
+    sql = (
+        "SELECT e.event_id, e.case_id, e.table_name, e.operation, e.trigger, "
+        "a.attr_key, c.before, c.after, c.note "
+        "FROM changes c "
+        "JOIN events e ON e.event_id = c.event_id "
+        "JOIN attrs a ON a.attr_id = c.attr_id"
+    )
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY c.event_id, c.attr_id"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+
+    for values in conn.execute(sql, params):
+        yield dict(zip(QUERY_COLUMNS, values))
+
+
+def list_attrs(conn, table=None):
+    sql = (
+        "SELECT a.attr_key, COUNT(c.event_id) FROM attrs a "
+        "LEFT JOIN changes c ON c.attr_id = a.attr_id"
+    )
+    params = []
+    if table:
+        sql += " WHERE a.table_name = ?"
+        params.append(table)
+    sql += " GROUP BY a.attr_id ORDER BY a.attr_id"
+    return conn.execute(sql, params).fetchall()
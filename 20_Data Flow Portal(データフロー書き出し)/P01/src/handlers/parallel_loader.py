@@ -0,0 +1,225 @@
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from src.handlers.context_filler import fill_context
+from src.handlers.csv_loader import validate_header
+from src.handlers.event_aggregator import aggregate_events
+from src.models import EventLog
+from src.utils.errors import UserInputError
+
+
+CHUNK_BYTES = 64 * 1024 * 1024
+SCAN_BYTES = 4 * 1024 * 1024
+
+
+class ChunkOverlapError(Exception):
+    """同じ (case_id, table) が複数チャンクにまたがり、チャンク単位の集約では再現できない。"""
+
+
+def parallel_ingest(path, csv_conf, workers=None, chunk_bytes=CHUNK_BYTES):
+    if not os.path.exists(path):
+        raise UserInputError(f"input CSV not found: {path}")
+    fieldnames, header_end = read_header(path)
+    validate_header(fieldnames, csv_conf["required_columns"])
+    chunks = plan_chunks(path, header_end, fieldnames, chunk_bytes)
+    tasks = [
+        (
+            path,
+            start,
+            end,
+            fieldnames,
+            csv_conf["carry_forward_columns"],
+            csv_conf["required_columns"],
+            csv_conf["null_values"],
+        )
+        for start, end in chunks
+    ]
+
+    if len(tasks) < 2:
+        results = [ingest_chunk(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(ingest_chunk, *task) for task in tasks]
+            results = [future.result() for future in futures]
+
+    raise_first_error(results)
+    return merge_chunks([result["events"] for result in results])
+
+
+def read_header(path):
+    with open(path, "rb") as f:
+        data = b""
+        while True:
+            line = f.readline()
+            data += line
+            if not line or data.count(b'"') % 2 == 0:
+                break
+    text = data.decode("utf-8")
+    fieldnames = next(csv.reader(io.StringIO(text, newline="")), None)
+    return fieldnames, len(data)
+
+
+def plan_chunks(path, header_end, fieldnames, chunk_bytes):
+    size = os.path.getsize(path)
+    case_index = fieldnames.index("case_id")
+    count = max(1, (size - header_end) // max(1, chunk_bytes))
+    boundaries = [header_end]
+    with open(path, "rb") as f:
+        parity = 0
+        position = header_end
+        for step in range(1, count):
+            target = header_end + (size - header_end) * step // count
+            if target <= boundaries[-1]:
+                continue
+            parity ^= count_quotes(f, position, target) % 2
+            position = target
+            boundary = find_case_boundary(f, target, parity, case_index)
+            if boundary is None:
+                break
+            parity ^= count_quotes(f, target, boundary) % 2
+            position = boundary
+            if boundary > boundaries[-1]:
+                boundaries.append(boundary)
+    boundaries.append(size)
+    return [
+        (start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start
+    ]
+
+
+def count_quotes(f, start, end):
+    f.seek(start)
+    total = 0
+    remaining = end - start
+    while remaining > 0:
+        block = f.read(min(SCAN_BYTES, remaining))
+        if not block:
+            break
+        total += block.count(b'"')
+        remaining -= len(block)
+    return total
+
+
+def find_case_boundary(f, offset, parity, case_index):
+    # offset から次のレコード先頭を探し、そこから case_id が切り替わるレコード先頭を返す
+    f.seek(offset)
+    position = offset
+    while True:
+        line = f.readline()
+        if not line:
+            return None
+        position += len(line)
+        parity ^= line.count(b'"') % 2
+        if parity == 0 and line.endswith(b"\n"):
+            break
+
+    first_case = None
+    while True:
+        start = position
+        record = read_record(f)
+        if record is None:
+            return None
+        position += len(record)
+        values = next(csv.reader(io.StringIO(record.decode("utf-8"), newline="")), [])
+        case_id = values[case_index] if case_index < len(values) else None
+        if first_case is None:
+            first_case = case_id
+        elif case_id != first_case:
+            return start
+
+
+def read_record(f):
+    data = b""
+    while True:
+        line = f.readline()
+        if not line:
+            return data or None
+        data += line
+        if data.count(b'"') % 2 == 0:
+            return data
+
+
+def ingest_chunk(path, start, end, fieldnames, carry_columns, required_columns, null_values):
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    reader = csv.DictReader(io.StringIO(text, newline=""), fieldnames=fieldnames)
+    rows = []
+    for idx, row in enumerate(reader, start=2):
+        row["_line_no"] = idx
+        rows.append(row)
+    try:
+        filled = fill_context(rows, carry_columns, required_columns)
+    except UserInputError as exc:
+        return {
+            "count": len(rows),
+            "error": (exc.message, exc.line_no, exc.row),
+        }
+    return {
+        "count": len(rows),
+        "events": aggregate_events(filled, null_values),
+        "error": None,
+    }
+
+
+def raise_first_error(results):
+    offset = 0
+    for result in results:
+        if result["error"]:
+            message, line_no, row = result["error"]
+            if line_no is not None:
+                line_no += offset
+            if row is not None and "_line_no" in row:
+                row["_line_no"] = line_no
+            raise UserInputError(message, line_no, row)
+        offset += result["count"]
+
+
+def merge_chunks(chunk_logs):
+    merged = EventLog()
+    registry = merged.registry
+    latest = merged.latest_by_table
+    keys = set()
+
+    for chunk in chunk_logs:
+        mapping = registry.merge(chunk.registry)
+        for attr_id, count in chunk.column_counts.items():
+            new_id = mapping[attr_id]
+            merged.column_counts[new_id] = merged.column_counts.get(new_id, 0) + count
+        offset = len(merged)
+        for attr_id, positions in chunk.lineage.items():
+            merged.lineage.setdefault(mapping[attr_id], []).extend(
+                position + offset for position in positions
+            )
+
+        visited = set()
+        for event in chunk:
+            key = (event.case_id, event.table)
+            if key in keys:
+                raise ChunkOverlapError(key)
+            keys.add(key)
+            event.changes = {mapping[attr_id]: change for attr_id, change in event.changes.items()}
+            rebase_chain(event.current_values, mapping, latest.get(event.table), visited)
+            merged.append(event)
+
+        for table, snapshot in chunk.latest_by_table.items():
+            previous = latest.get(table)
+            if previous is not None:
+                previous._sealed = True
+            latest[table] = snapshot
+    return merged
+
+
+def rebase_chain(snapshot, mapping, previous, visited):
+    # チャンク内で親を持たないノードは直前チャンクの最新状態を起点にしていたはずなので、その値を取り込む
+    node = snapshot
+    while node is not None and id(node) not in visited:
+        visited.add(id(node))
+        values = {mapping[attr_id]: value for attr_id, value in node._values.items()}
+        if node._parent is None and previous is not None:
+            base = previous.to_dict()
+            base.update(values)
+            values = base
+        node._values = values
+        node = node._parent
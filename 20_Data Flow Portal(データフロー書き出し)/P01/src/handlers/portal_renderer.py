@@ -1,16 +1,42 @@
+import hashlib
+import json
 import os
+import re
 from datetime import datetime
 
-from src.utils.fs import ensure_dir, write_text
+from src.handlers.event_aggregator import build_lineage
+from src.handlers.renderer_version import RENDERER_VERSION
+from src.models import EventLog
+from src.utils.compress import build_size_report, compress_outputs
+from src.utils.fs import ensure_dir, write_chunks, write_text, write_text_if_changed
+from src.utils.nulls import build_null_matcher
+from src.utils.snapshot import materialize
+
+
+SHARD_DIR = "shards"
+SIZE_REPORT_NAME = "size_report.json"
+LINEAGE_PAGE = "lineage.html"
+
+STICKY_GROUP_CLASS = "fix-group"
+
+_MISSING = object()
 
 
 class PortalRenderer:
-    def __init__(self, config):
+    def __init__(self, config, null_matcher=None):
         self.config = config
-        self.null_values = set(
-            [str(v).lower() for v in config["csv"].get("null_values", [])]
-        )
+        self.is_null = (
+            null_matcher or build_null_matcher(config["csv"].get("null_values", []))
+        ).match
         self.fixed_columns = config["display"].get("fixed_columns", [])
+        self.previous_pages = {}
+        self.page_hashes = {}
+        self.skipped_pages = []
+        self.input_links = {}
+        self.compare_csv = None
+        self.lineage_href = None
+        self.outputs = []
+        self.size_report = None
 
     def render(self, events, columns, input_csv):
         output_dir = self.config["paths"]["output_dir"]
@@ -18,33 +44,463 @@ class PortalRenderer:
         ensure_dir(output_dir)
         ensure_dir(assets_dir)
 
-        css_path = os.path.join(assets_dir, "style.css")
-        write_text(css_path, build_css())
+        css_path = os.path.join(self.style_dir, "style.css")
+        ensure_dir(self.style_dir)
+        write_text_if_changed(css_path, build_css())
+        self.outputs.append(css_path)
+
+        if self.config["display"].get("lineage_page", False):
+            self.render_lineage(events, columns, input_csv)
+
+        shard_by = self.config["display"].get("shard_by", "none")
+        if shard_by in ("case", "table"):
+            index_path = self.render_shards(events, columns, input_csv, shard_by)
+        else:
+            index_path = self.render_page(events, columns, input_csv, "index.html")
+        self.finish_outputs()
+        return index_path
+
+    def finish_outputs(self):
+        output_conf = self.config.get("output", {})
+        formats = output_conf.get("compress", [])
+        if formats:
+            compress_outputs(self.outputs, formats)
+        if output_conf.get("size_report", False):
+            output_dir = self.config["paths"]["output_dir"]
+            self.size_report = build_size_report(output_dir, self.outputs)
+            write_text(
+                os.path.join(output_dir, SIZE_REPORT_NAME),
+                json.dumps(self.size_report, ensure_ascii=False, indent=2),
+            )
+
+    @property
+    def style_dir(self):
+        paths = self.config["paths"]
+        return paths.get("shared_assets_dir") or paths["assets_dir"]
 
-        html = self.build_html(events, columns, input_csv, "assets/style.css")
+    def css_href(self, page_path):
+        css_path = os.path.join(self.style_dir, "style.css")
+        return os.path.relpath(css_path, os.path.dirname(page_path)).replace(os.sep, "/")
+
+    def build_input_links(self, prefix):
+        return {path: prefix + href for path, href in self.input_links.items()}
+
+    def render_page(self, events, columns, input_csv, page_name, navigation=None):
+        output_dir = self.config["paths"]["output_dir"]
+        page_path = os.path.join(output_dir, *page_name.split("/"))
+        prefix = "../" * page_name.count("/")
+        css_href = self.css_href(page_path)
+        input_links = self.build_input_links(prefix)
+
+        if self.config["display"].get("render_mode", "table") == "virtual":
+            data_name = "events.js"
+            if page_name != "index.html":
+                data_name = os.path.splitext(page_name.replace("/", "_"))[0] + ".js"
+            data_path = os.path.join(self.config["paths"]["assets_dir"], data_name)
+            write_chunks(data_path, self.iter_virtual_data(events, columns))
+            self.outputs.append(data_path)
+            html = self.build_virtual_html(
+                events,
+                columns,
+                input_csv,
+                css_href,
+                f"{prefix}assets/{data_name}",
+                navigation,
+                input_links,
+            )
+            write_text(page_path, html)
+            self.outputs.append(page_path)
+            return page_path
+
+        self.outputs.append(page_path)
+        write_chunks(
+            page_path,
+            self.iter_html(
+                events, columns, input_csv, css_href, navigation, input_links
+            ),
+        )
+        return page_path
+
+    def render_shards(self, events, columns, input_csv, shard_by):
+        output_dir = self.config["paths"]["output_dir"]
+        shard_size = int(self.config["display"].get("shard_size", 200) or 200)
+        if shard_by == "table":
+            shards = build_table_shards(events)
+        else:
+            shards = build_case_shards(events, shard_size)
+
+        context = (
+            RENDERER_VERSION,
+            json.dumps(self.config, sort_keys=True, ensure_ascii=False, default=str),
+            input_csv,
+            [(shard["label"], shard["page"]) for shard in shards],
+        )
+        written = set()
+        for shard in shards:
+            page = shard["page"]
+            shard_events = EventLog(shard["events"], events.registry)
+            shard_columns = filter_columns(shard_events, columns)
+            fingerprint = fingerprint_page(shard_events, shard_columns, context)
+            self.page_hashes[page] = fingerprint
+            written.add(page)
+            page_path = os.path.join(output_dir, *page.split("/"))
+            if self.previous_pages.get(page) == fingerprint and os.path.exists(page_path):
+                self.skipped_pages.append(page)
+                self.outputs.append(page_path)
+                continue
+            navigation = build_shard_navigation(shards, page, shard_by)
+            self.render_page(shard_events, shard_columns, input_csv, page, navigation)
+
+        remove_stale_shards(os.path.join(output_dir, SHARD_DIR), written)
         index_path = os.path.join(output_dir, "index.html")
-        write_text(index_path, html)
+        write_text(
+            index_path,
+            self.build_shard_index(shards, input_csv, shard_by, self.css_href(index_path)),
+        )
+        self.outputs.append(index_path)
         return index_path
 
-    def build_html(self, events, columns, input_csv, css_path):
+    def render_lineage(self, events, columns, input_csv):
+        output_dir = self.config["paths"]["output_dir"]
+        page_path = os.path.join(output_dir, LINEAGE_PAGE)
+        write_chunks(
+            page_path,
+            self.iter_lineage_html(events, columns, input_csv, self.css_href(page_path)),
+        )
+        self.lineage_href = LINEAGE_PAGE
+        self.outputs.append(page_path)
+        return page_path
+
+    def iter_lineage_html(self, events, columns, input_csv, css_path):
         generated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        fixed_widths = build_fixed_widths(self.fixed_columns)
-        left_offsets = build_left_offsets(fixed_widths)
+        meta_html = build_meta(
+            generated_at,
+            input_csv,
+            self.config["display"].get("show_generated_at", True),
+            self.config["display"].get("show_input_name", True),
+            self.compare_csv,
+        )
         table_labels = self.config["display"].get("table_labels", {})
+        is_null = self.is_null
+        registry = events.registry
+        lineage = events.lineage or build_lineage(events)
+        attrs = [
+            (attr_id, col)
+            for attr_id, col in ((registry.lookup(col), col) for col in columns)
+            if lineage.get(attr_id)
+        ]
 
+        nav_items = "".join(
+            f"<li><a href='#attr-{attr_id}'>{escape_html(col)}</a> ({len(lineage[attr_id])})</li>"
+            for attr_id, col in attrs
+        )
+        yield f"""<!DOCTYPE html>
+<html lang="ja">
+<head>
+  <meta charset="utf-8" />
+  <title>Data Flow Portal - 属性の推移</title>
+  <link rel="stylesheet" href="{css_path}">
+</head>
+<body>
+  <div class="portal-container">
+    <h1>属性の推移</h1>
+    <div class="meta">{meta_html} | <a href="index.html">一覧へ戻る</a></div>
+    <ul class="lineage-nav">{nav_items}</ul>
+"""
+        for attr_id, col in attrs:
+            table_name, attr = split_attr_key(col)
+            heading = escape_html(attr)
+            if table_name:
+                heading = f"{format_table_value(table_name, table_labels).replace('<br>', ' ')} :: {heading}"
+            yield (
+                f"<section class='lineage' id='attr-{attr_id}'><h2>{heading}</h2>"
+                "<div class='table-wrap'><table><thead><tr>"
+                "<th>#</th><th>case_id</th><th>operation</th><th>trigger</th>"
+                "<th>変更</th><th>変更後の状態</th><th>note</th>"
+                "</tr></thead><tbody>"
+            )
+            previous = _MISSING
+            rows = []
+            for step, position in enumerate(lineage[attr_id], start=1):
+                event = events[position]
+                change = event.changes[attr_id]
+                before = None if is_null(change.before) else change.before
+                row_class = ""
+                title = ""
+                # 直前イベントの状態と before が食い違う箇所は、CSVに出ていない更新があった印
+                if previous is not _MISSING and before != previous:
+                    row_class = " class='lineage-gap'"
+                    title = f" title='直前の状態: {display_value(previous, is_null)}'"
+                state = event.current_values.get(attr_id)
+                change_html = render_change(
+                    event.case_id,
+                    attr,
+                    change.before,
+                    change.after,
+                    is_null,
+                    event.operation,
+                    event.trigger,
+                )
+                rows.append(
+                    f"<tr{row_class}{title}><td>{step}</td>"
+                    f"<td>{escape_html(event.case_id)}</td>"
+                    f"<td>{escape_html(event.operation or '')}</td>"
+                    f"<td>{escape_html(event.trigger or '')}</td>"
+                    f"<td>{change_html}</td>"
+                    f"<td>{display_value(state, is_null)}</td>"
+                    f"<td>{escape_html(change.note or '')}</td></tr>"
+                )
+                previous = state
+            yield "".join(rows) + "</tbody></table></div></section>\n"
+        yield """  </div>
+</body>
+</html>
+"""
+
+    def build_shard_index(self, shards, input_csv, shard_by, css_path="assets/style.css"):
+        generated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        meta_html = build_meta(
+            generated_at,
+            input_csv,
+            self.config["display"].get("show_generated_at", True),
+            self.config["display"].get("show_input_name", True),
+            self.compare_csv,
+        )
+        if self.lineage_href:
+            meta_html += f" | <a href='{self.lineage_href}'>属性の推移</a>"
+        heading = "テーブル" if shard_by == "table" else "ケース範囲"
+        table_labels = self.config["display"].get("table_labels", {})
+        rows = []
+        for shard in shards:
+            label = escape_html(shard["label"])
+            if shard_by == "table" and table_labels.get(shard["label"]):
+                label = format_table_value(shard["label"], table_labels)
+            rows.append(
+                f"<tr><td><a href='{escape_html(shard['page'])}'>{label}</a></td>"
+                f"<td>{len(shard['events'])}</td></tr>"
+            )
+        return f"""<!DOCTYPE html>
+<html lang="ja">
+<head>
+  <meta charset="utf-8" />
+  <title>Data Flow Portal</title>
+  <link rel="stylesheet" href="{css_path}">
+</head>
+<body>
+  <div class="portal-container">
+    <h1>Data Flow Portal</h1>
+    <div class="meta">{meta_html}</div>
+    <div class="table-wrap">
+      <table class="shard-index">
+        <thead>
+          <tr><th>{heading}</th><th>イベント数</th></tr>
+        </thead>
+        <tbody>
+          {''.join(rows)}
+        </tbody>
+      </table>
+    </div>
+  </div>
+</body>
+</html>
+"""
+
+    def build_html(
+        self, events, columns, input_csv, css_path, navigation=None, input_links=None
+    ):
+        return "".join(
+            self.iter_html(events, columns, input_csv, css_path, navigation, input_links)
+        )
+
+    def iter_html(
+        self, events, columns, input_csv, css_path, navigation=None, input_links=None
+    ):
+        table_labels = self.config["display"].get("table_labels", {})
+        header_rows, grouped_columns, col_group_map, group_starts = self.build_header(
+            events, columns
+        )
+        fixed_plan = build_fixed_cell_plan(self.fixed_columns)
+        column_plan = build_column_plan(grouped_columns, group_starts, events.registry)
+        is_null = self.is_null
+        diff = bool(self.compare_csv)
+        head_html, tail_html = self.build_page_frame(
+            events,
+            input_csv,
+            css_path,
+            header_rows,
+            build_filter_index_script(
+                build_filter_index(
+                    events, grouped_columns, col_group_map, len(self.fixed_columns)
+                )
+            )
+            + build_filter_script()
+            + build_navigation_script(navigation),
+            navigation=navigation,
+            input_links=input_links,
+        )
+
+        yield head_html
+        for event in events:
+            operation = (event.operation or "").lower()
+            row_class = f"op-{operation}" if operation else ""
+            table_value = escape_html(event.table)
+            case_value = escape_html(event.case_id)
+            changes = event.changes
+            current_values = materialize(event.current_values)
+            row_cells = []
+
+            for col, cell_open in fixed_plan:
+                value = event.get(col, "")
+                if col == "table":
+                    cell_value = format_table_value(value, table_labels)
+                else:
+                    cell_value = escape_html(value)
+                row_cells.append(f"{cell_open}{cell_value}</td>")
+
+            for col_id, cell_open, empty_cell, label in column_plan:
+                change = changes.get(col_id)
+                if not change:
+                    current = current_values.get(col_id)
+                    if not is_null(current):
+                        row_cells.append(
+                            f"{cell_open}<span class='change current'>"
+                            f"{display_value(current, is_null)}</span></td>"
+                        )
+                    else:
+                        row_cells.append(empty_cell)
+                    continue
+                cell_html = render_change(
+                    event.case_id,
+                    label,
+                    change.before,
+                    change.after,
+                    is_null,
+                    event.operation,
+                    event.trigger,
+                    change.note if diff else None,
+                )
+                row_cells.append(f"{cell_open}{cell_html}</td>")
+
+            yield (
+                f"<tr class='{row_class}' data-table='{table_value}' data-case='{case_value}'>"
+                + "".join(row_cells)
+                + "</tr>"
+            )
+        yield tail_html
+
+    def build_virtual_html(
+        self,
+        events,
+        columns,
+        input_csv,
+        css_path,
+        data_path,
+        navigation=None,
+        input_links=None,
+    ):
+        header_rows, _, _, _ = self.build_header(events, columns)
+        script_html = (
+            f"\n  <script src=\"{data_path}\"></script>"
+            + build_virtual_script()
+            + build_navigation_script(navigation)
+        )
+        return self.build_page(
+            events,
+            input_csv,
+            css_path,
+            header_rows,
+            "",
+            script_html,
+            wrap_attrs='class="table-wrap virtual" id="tableWrap"',
+            body_attrs=" id=\"virtualBody\"",
+            navigation=navigation,
+            input_links=input_links,
+        )
+
+    def build_virtual_data(self, events, columns):
+        return "".join(self.iter_virtual_data(events, columns))
+
+    def iter_virtual_data(self, events, columns):
+        yield "window.PORTAL_DATA = "
+        yield from self.iter_table_json(events, columns)
+        yield ";\n"
+
+    def iter_table_json(self, events, columns):
+        table_labels = self.config["display"].get("table_labels", {})
+        table_groups = build_table_groups(events, columns)
+        grouped_columns = [col for _, cols in table_groups for col in cols]
+        group_starts = build_group_starts(table_groups)
+        column_ids = [events.registry.lookup(col) for col in grouped_columns]
+        is_null = self.is_null
+        diff = bool(self.compare_csv)
+
+        meta = {
+            "fixedClasses": [
+                f"sticky-col {build_sticky_class(idx)}" for idx in range(len(self.fixed_columns))
+            ],
+            "groups": [group for group, cols in table_groups for _ in cols],
+            "labels": [extract_attr_label(col) for col in grouped_columns],
+            "starts": [
+                idx for idx, col in enumerate(grouped_columns) if col in group_starts
+            ],
+            "index": build_row_index(events),
+        }
+        yield to_compact_json(meta)[:-1] + ',"rows":['
+
+        for position, event in enumerate(events):
+            operation = (event.operation or "").lower()
+            fixed_cells = []
+            for col in self.fixed_columns:
+                value = event.get(col, "")
+                if col == "table":
+                    fixed_cells.append(format_table_value(value, table_labels))
+                else:
+                    fixed_cells.append(escape_html(value))
+
+            current_values = materialize(event.current_values)
+            cells = []
+            for idx, col_id in enumerate(column_ids):
+                change = event.changes.get(col_id)
+                if change:
+                    kind, before_text, after_text = classify_change(
+                        change.before, change.after, is_null, diff
+                    )
+                    if kind == "before-changed":
+                        # before 欄には差分の内訳（基準 / 比較の before -> after）を入れ、title に出す
+                        before_text = escape_html(change.note)
+                    cells.extend((idx, kind, before_text, after_text))
+                    continue
+                current = current_values.get(col_id)
+                if not is_null(current):
+                    cells.extend((idx, "current", display_value(current, is_null), ""))
+
+            row = [
+                f"op-{operation}" if operation else "",
+                event.table or "",
+                event.case_id or "",
+                event.operation or "",
+                event.trigger or "",
+                fixed_cells,
+                cells,
+            ]
+            yield ("," if position else "") + to_compact_json(row)
+        yield "]}"
+
+    def build_header(self, events, columns):
         legend_html = ""
         if self.config["display"].get("show_legend", True):
-            legend_html = """
+            diff_badge = ""
+            if self.compare_csv:
+                diff_badge = '\n              <span class="badge before-changed">before のみ差分</span>'
+            legend_html = f"""
             <div class="legend inline">
               <span class="badge added">added</span>
               <span class="badge removed">removed</span>
               <span class="badge changed">changed</span>
-              <span class="badge same">same</span>
+              <span class="badge same">same</span>{diff_badge}
             </div>
             """
 
-        fixed_total = sum(fixed_widths)
-        fixed_group_style = build_sticky_style(0, fixed_total)
         table_groups = build_table_groups(events, columns)
         grouped_columns = [col for _, cols in table_groups for col in cols]
         col_group_map = {}
@@ -53,8 +509,8 @@ class PortalRenderer:
                 col_group_map[col] = label
 
         header_group = (
-            f"<th class='group-header sticky-top-1 sticky-col fixed-header-top' "
-            f"style='{fixed_group_style}' colspan='{len(self.fixed_columns)}'>"
+            f"<th class='group-header sticky-top-1 sticky-col fixed-header-top {STICKY_GROUP_CLASS}' "
+            f"colspan='{len(self.fixed_columns)}'>"
             "対象・フロー（固定）</th>"
             f"<th id='changeGroupHeader' class='group-header sticky-top-1 fixed-header-top' "
             f"data-count='{len(grouped_columns)}' colspan='{len(grouped_columns)}'>"
@@ -62,8 +518,8 @@ class PortalRenderer:
             "</th>"
         )
         table_group_cells = [
-            f"<th class='sticky-top-2 group-header sticky-col fixed-header-top' "
-            f"style='{fixed_group_style}' colspan='{len(self.fixed_columns)}'></th>"
+            f"<th class='sticky-top-2 group-header sticky-col fixed-header-top {STICKY_GROUP_CLASS}' "
+            f"colspan='{len(self.fixed_columns)}'></th>"
         ]
         for label, cols in table_groups:
             table_group_cells.append(
@@ -73,10 +529,9 @@ class PortalRenderer:
 
         header_cells = []
         for idx, col in enumerate(self.fixed_columns):
-            style = build_sticky_style(left_offsets[idx], fixed_widths[idx])
             header_cells.append(
-                f"<th class='sticky-col sticky-top-3 fixed-header-top' "
-                f"style='{style}'>{col}</th>"
+                f"<th class='sticky-col sticky-top-3 fixed-header-top {build_sticky_class(idx)}'>"
+                f"{col}</th>"
             )
         group_starts = build_group_starts(table_groups)
         for col in grouped_columns:
@@ -87,96 +542,88 @@ class PortalRenderer:
                 f"<th class='sticky-top-3 fixed-header-top{start_class}' data-group='{group}'>{label}</th>"
             )
 
-        body_rows = []
-        for event in events:
-            operation = (event.get("operation") or "").lower()
-            row_class = f"op-{operation}" if operation else ""
-            table_value = escape_html(event.get("table", ""))
-            case_value = escape_html(event.get("case_id", ""))
-            row_cells = []
-
-            for idx, col in enumerate(self.fixed_columns):
-                value = event.get(col, "")
-                style = build_sticky_style(left_offsets[idx], fixed_widths[idx])
-                if col == "table":
-                    cell_value = format_table_value(value, table_labels)
-                else:
-                    cell_value = escape_html(value)
-                row_cells.append(
-                    f"<td class='sticky-col' style='{style}'>{cell_value}</td>"
-                )
-
-            for col in grouped_columns:
-                change = event["changes"].get(col)
-                if not change:
-                    group = col_group_map.get(col, "")
-                    current = (event.get("current_values") or {}).get(col)
-                    if current is not None and not is_null(current, self.null_values):
-                        current_text = display_value(current, self.null_values)
-                        row_cells.append(
-                            f"<td data-group='{group}'{(' class=\"group-start\"' if col in group_starts else '')}>"
-                            f"<span class='change current'>{current_text}</span>"
-                            "</td>"
-                        )
-                    else:
-                        row_cells.append(
-                            f"<td class='empty{(' group-start' if col in group_starts else '')}' data-group='{group}'></td>"
-                        )
-                    continue
-                cell_html = render_change(
-                    event.get("case_id", ""),
-                    extract_attr_label(col),
-                    change.get("before", ""),
-                    change.get("after", ""),
-                    self.null_values,
-                    event.get("operation", ""),
-                    event.get("trigger", ""),
-                )
-                group = col_group_map.get(col, "")
-                row_cells.append(
-                    f"<td data-group='{group}'{(' class=\"group-start\"' if col in group_starts else '')}>{cell_html}</td>"
-                )
-
-            body_rows.append(
-                f"<tr class='{row_class}' data-table='{table_value}' data-case='{case_value}'>"
-                + "".join(row_cells)
-                + "</tr>"
-            )
-
+        header_rows = (header_group, "".join(table_group_cells), "".join(header_cells))
+        return header_rows, grouped_columns, col_group_map, group_starts
+
+    def build_page(
+        self,
+        events,
+        input_csv,
+        css_path,
+        header_rows,
+        body_html,
+        script_html,
+        wrap_attrs='class="table-wrap"',
+        body_attrs="",
+        navigation=None,
+        input_links=None,
+    ):
+        head_html, tail_html = self.build_page_frame(
+            events,
+            input_csv,
+            css_path,
+            header_rows,
+            script_html,
+            wrap_attrs,
+            body_attrs,
+            navigation,
+            input_links,
+        )
+        return head_html + body_html + tail_html
+
+    def build_page_frame(
+        self,
+        events,
+        input_csv,
+        css_path,
+        header_rows,
+        script_html,
+        wrap_attrs='class="table-wrap"',
+        body_attrs="",
+        navigation=None,
+        input_links=None,
+    ):
+        generated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         meta_html = build_meta(
             generated_at,
             input_csv,
             self.config["display"].get("show_generated_at", True),
             self.config["display"].get("show_input_name", True),
+            self.compare_csv,
         )
+        if self.lineage_href and navigation is None:
+            meta_html += f" | <a href='{self.lineage_href}'>属性の推移</a>"
         controls_html = build_controls(
             events,
             self.config["display"].get("input_candidates", []),
             input_csv,
+            navigation,
+            input_links,
         )
-        script_html = build_filter_script()
 
-        return f"""<!DOCTYPE html>
+        head_html = f"""<!DOCTYPE html>
 <html lang="ja">
 <head>
   <meta charset="utf-8" />
   <title>Data Flow Portal</title>
   <link rel="stylesheet" href="{css_path}">
+  <style>{build_sticky_css(self.fixed_columns)}</style>
 </head>
 <body>
   <div class="portal-container">
     <h1>Data Flow Portal</h1>
     <div class="meta">{meta_html}</div>
     {controls_html}
-    <div class="table-wrap">
+    <div {wrap_attrs}>
       <table>
         <thead>
-          <tr>{header_group}</tr>
-          <tr>{''.join(table_group_cells)}</tr>
-          <tr>{''.join(header_cells)}</tr>
+          <tr>{header_rows[0]}</tr>
+          <tr>{header_rows[1]}</tr>
+          <tr>{header_rows[2]}</tr>
         </thead>
-        <tbody>
-          {''.join(body_rows)}
+        <tbody{body_attrs}>
+          """
+        tail_html = f"""
         </tbody>
       </table>
     </div>
@@ -185,6 +632,11 @@ class PortalRenderer:
 </body>
 </html>
 """
+        return head_html, tail_html
+
+
+def to_compact_json(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
 
 
 def build_css():
@@ -244,7 +696,8 @@ h1 {
   gap: 8px;
 }
 
-.controls select {
+.controls select,
+.controls input {
   padding: 4px 6px;
   border-radius: 6px;
   border: 1px solid var(--line);
@@ -268,6 +721,7 @@ h1 {
 .badge.removed { color: var(--removed); }
 .badge.changed { color: var(--changed); }
 .badge.same { color: var(--same); }
+.badge.before-changed { color: var(--changed); }
 
 .table-wrap {
   overflow: auto;
@@ -433,15 +887,59 @@ td.sticky-col {
   color: var(--same);
 }
 
+.change.before-changed {
+  border-bottom: 2px dotted var(--update);
+}
+
 .change.current {
   color: var(--muted);
   font-style: italic;
 }
 
+.lineage-nav {
+  columns: 3 240px;
+  margin: 0 0 16px;
+  padding-left: 20px;
+}
+
+.lineage h2 {
+  font-size: 15px;
+  margin: 20px 0 6px;
+}
+
+tr.lineage-gap td {
+  background: #fff7ed;
+}
+
+tr.lineage-gap td:first-child {
+  border-left: 3px solid #f59e0b;
+}
+
 .group-start {
   border-left: 3px solid #94a3b8 !important;
 }
 
+.table-wrap.virtual {
+  max-height: calc(100vh - 160px);
+}
+
+tbody.filtered tr {
+  display: none;
+}
+
+tbody.filtered tr.match {
+  display: table-row;
+}
+
+.table-wrap.virtual tbody tr:not(.spacer) td {
+  height: 52px;
+}
+
+.table-wrap.virtual tbody tr.spacer td {
+  padding: 0;
+  border: 0;
+}
+
 .fixed-header-top {
   border-top: 3px solid #94a3b8 !important;
 }
@@ -513,64 +1011,98 @@ def build_sticky_style(left, width):
     )
 
 
-def render_change(case_id, attr_type, before, after, null_values, operation, trigger):
+def build_sticky_class(idx):
+    return f"fix-{idx}"
+
+
+def build_sticky_css(fixed_columns):
+    # 固定列の位置・幅はセルごとの style 属性ではなく、列ごとのクラスとしてページに1回だけ書く
+    fixed_widths = build_fixed_widths(fixed_columns)
+    left_offsets = build_left_offsets(fixed_widths)
+    rules = [
+        f".sticky-col.{build_sticky_class(idx)} {{ {build_sticky_style(left, width)} }}"
+        for idx, (left, width) in enumerate(zip(left_offsets, fixed_widths))
+    ]
+    rules.append(f".sticky-col.{STICKY_GROUP_CLASS} {{ {build_sticky_style(0, sum(fixed_widths))} }}")
+    return " ".join(rules)
+
+
+def build_fixed_cell_plan(fixed_columns):
+    return [
+        (col, f"<td class='sticky-col {build_sticky_class(idx)}'>")
+        for idx, col in enumerate(fixed_columns)
+    ]
+
+
+def build_column_plan(grouped_columns, group_starts, registry):
+    plan = []
+    for col in grouped_columns:
+        if col in group_starts:
+            cell_open = "<td class='group-start'>"
+            empty_cell = "<td class='empty group-start'></td>"
+        else:
+            cell_open = "<td>"
+            empty_cell = "<td class='empty'></td>"
+        plan.append((registry.lookup(col), cell_open, empty_cell, extract_attr_label(col)))
+    return plan
+
+
+def render_change(case_id, attr_type, before, after, is_null, operation, trigger, diff_note=None):
     detail_text = (
         f"{case_id} / {attr_type}\n"
         f"operation: {operation}\n"
         f"trigger: {trigger}\n"
         "詳細は後で追記"
     )
-    before_text = display_value(before, null_values)
-    after_text = display_value(after, null_values)
-    before_is_null = is_null(before, null_values)
-    after_is_null = is_null(after, null_values)
+    kind, before_text, after_text = classify_change(before, after, is_null, diff_note is not None)
 
-    if before_is_null and after_is_null:
+    if kind == "before-changed":
         return (
-            f"<span class='change same detail-hover' data-detail='{escape_html(detail_text)}'>"
-            f"{before_text}</span>"
+            f"<span class='change before-changed detail-hover' data-detail='{escape_html(detail_text)}'"
+            f" title='{escape_html(diff_note)}'>{after_text}</span>"
         )
-    if not before_is_null and not after_is_null and before_text == after_text:
+    if kind == "same":
         return (
             f"<span class='change same detail-hover' data-detail='{escape_html(detail_text)}'>"
             f"{before_text}</span>"
         )
-    if before_is_null and not after_is_null:
+    if kind == "added":
         return (
             f"<span class='change detail-hover' data-detail='{escape_html(detail_text)}'>"
             f"<span class='after added'>{after_text}</span>"
             "</span>"
         )
-    if not before_is_null and after_is_null:
-        return (
-            f"<span class='change detail-hover' data-detail='{escape_html(detail_text)}'>"
-            f"<span class='before'>{before_text}</span>"
-            "<span class='arrow'>→</span>"
-            f"<span class='after removed'>{after_text}</span>"
-            "</span>"
-        )
     return (
         f"<span class='change detail-hover' data-detail='{escape_html(detail_text)}'>"
         f"<span class='before'>{before_text}</span>"
         "<span class='arrow'>→</span>"
-        f"<span class='after changed'>{after_text}</span>"
+        f"<span class='after {kind}'>{after_text}</span>"
         "</span>"
     )
 
 
-def display_value(value, null_values):
-    if is_null(value, null_values):
-        return "NULL"
-    return escape_html(str(value))
+def classify_change(before, after, is_null, diff=False):
+    before_is_null = is_null(before)
+    after_is_null = is_null(after)
+    before_text = "NULL" if before_is_null else escape_html(str(before))
+    after_text = "NULL" if after_is_null else escape_html(str(after))
+
+    if (before_is_null and after_is_null) or (
+        not before_is_null and not after_is_null and before_text == after_text
+    ):
+        # 差分セルは「基準の after → 比較の after」なので、一致するのは before だけが違う場合
+        return ("before-changed" if diff else "same"), before_text, after_text
+    if before_is_null and not after_is_null:
+        return "added", before_text, after_text
+    if not before_is_null and after_is_null:
+        return "removed", before_text, after_text
+    return "changed", before_text, after_text
 
 
-def is_null(value, null_values):
-    if value is None:
-        return True
-    text = str(value).strip()
-    if text == "":
-        return True
-    return text.lower() in null_values
+def display_value(value, is_null):
+    if is_null(value):
+        return "NULL"
+    return escape_html(str(value))
 
 
 def escape_html(text):
@@ -597,7 +1129,7 @@ def build_table_filter(events):
     tables = []
     seen = set()
     for event in events:
-        table = (event.get("table") or "").strip()
+        table = (event.table or "").strip()
         if table and table not in seen:
             seen.add(table)
             tables.append(table)
@@ -611,10 +1143,10 @@ def build_case_filter(events):
     cases = []
     seen = set()
     for event in events:
-        case_id = (event.get("case_id") or "").strip()
+        case_id = (event.case_id or "").strip()
         if case_id and case_id not in seen:
             seen.add(case_id)
-            trigger = (event.get("trigger") or "").strip()
+            trigger = (event.trigger or "").strip()
             label = f"{case_id}:{trigger}" if trigger else case_id
             cases.append((case_id, label))
     options = ["<option value=''>すべて</option>"]
@@ -625,52 +1157,163 @@ def build_case_filter(events):
     return f"<select id='caseFilter'>{''.join(options)}</select>"
 
 
-def build_controls(events, input_candidates, current_input):
+def build_controls(
+    events, input_candidates, current_input, navigation=None, input_links=None
+):
     options = []
     for path in input_candidates:
         selected = " selected" if path == current_input else ""
-        options.append(f"<option value='{escape_html(path)}'{selected}>{escape_html(os.path.basename(path))}</option>")
+        value = input_links.get(path, path) if input_links else path
+        options.append(f"<option value='{escape_html(value)}'{selected}>{escape_html(os.path.basename(path))}</option>")
+    if input_links:
+        input_attrs = " data-navigate=\"1\""
+        input_hint = "選択すると切り替わります"
+    else:
+        input_attrs = ""
+        input_hint = "選択後は再生成が必要です"
+    if navigation and navigation["shard_by"] == "table":
+        table_control = (
+            f"<a href='{navigation['index_href']}'>一覧</a>"
+            "<label for=\"shardNav\">テーブル:</label>"
+            f"{build_shard_select(navigation)}"
+        )
+    else:
+        table_control = (
+            "<label for=\"tableFilter\">テーブル絞り込み:</label>"
+            f"{build_table_filter(events)}"
+        )
+        if navigation:
+            table_control = (
+                f"<a href='{navigation['index_href']}'>一覧</a>"
+                "<label for=\"shardNav\">ケース範囲:</label>"
+                f"{build_shard_select(navigation)}"
+                + table_control
+            )
     return (
         "<div class=\"controls\">"
-        "<label for=\"tableFilter\">テーブル絞り込み:</label>"
-        f"{build_table_filter(events)}"
+        f"{table_control}"
         "<label for=\"caseFilter\">ケース絞り込み:</label>"
         f"{build_case_filter(events)}"
+        "<label for=\"caseSearch\">ケースID検索:</label>"
+        "<input type=\"search\" id=\"caseSearch\" placeholder=\"case_id\">"
         "<label for=\"inputSelector\">入力CSV:</label>"
-        f"<select id=\"inputSelector\">{''.join(options)}</select>"
-        "<span class=\"hint\" id=\"inputHint\">選択後は再生成が必要です</span>"
+        f"<select id=\"inputSelector\"{input_attrs}>{''.join(options)}</select>"
+        f"<span class=\"hint\" id=\"inputHint\">{input_hint}</span>"
         "</div>"
     )
 
 
-def build_meta(generated_at, input_csv, show_generated_at, show_input_name):
+def build_shard_select(navigation):
+    options = []
+    for label, href, selected in navigation["links"]:
+        flag = " selected" if selected else ""
+        options.append(
+            f"<option value='{escape_html(href)}'{flag}>{escape_html(label)}</option>"
+        )
+    return f"<select id='shardNav'>{''.join(options)}</select>"
+
+
+def build_meta(generated_at, input_csv, show_generated_at, show_input_name, compare_csv=None):
     meta_parts = []
     if show_generated_at:
         meta_parts.append(f"Generated: {generated_at}")
     if show_input_name:
         meta_parts.append(f"Input: {os.path.basename(input_csv)}")
+        if compare_csv:
+            meta_parts[-1] += f" → {os.path.basename(compare_csv)}（差分）"
     return " | ".join(meta_parts)
 
 
+def build_filter_index(events, grouped_columns, col_group_map, fixed_count):
+    index = build_row_index(events)
+    groups = {}
+    for idx, col in enumerate(grouped_columns):
+        ranges = groups.setdefault(col_group_map.get(col, ""), [])
+        if ranges and ranges[-1][1] == idx:
+            ranges[-1][1] = idx + 1
+        else:
+            ranges.append([idx, idx + 1])
+    index["groups"] = groups
+    index["fixed"] = fixed_count
+    return index
+
+
+def build_row_index(events):
+    tables = {}
+    cases = {}
+    for position, event in enumerate(events):
+        tables.setdefault(event.table or "", []).append(position)
+        cases.setdefault(event.case_id or "", []).append(position)
+    return {"tables": tables, "cases": cases}
+
+
+def build_filter_index_script(index):
+    data = to_compact_json(index).replace("</", "<\\/")
+    return f"""
+  <script>window.PORTAL_INDEX = {data};</script>"""
+
+
+def build_match_rows_script():
+    return """
+    const portalMatchRows = (index, tableValue, caseValue, searchValue) => {
+      const lists = [];
+      if (tableValue !== '') {
+        lists.push(index.tables[tableValue] || []);
+      }
+      if (caseValue !== '') {
+        lists.push(index.cases[caseValue] || []);
+      }
+      if (searchValue !== '') {
+        if (!index.caseKeys) {
+          index.caseKeys = Object.keys(index.cases).map((caseId) => [caseId, caseId.toLowerCase()]);
+        }
+        const needle = searchValue.toLowerCase();
+        const found = [];
+        index.caseKeys.forEach(([caseId, key]) => {
+          if (key.includes(needle)) {
+            index.cases[caseId].forEach((idx) => found.push(idx));
+          }
+        });
+        lists.push(found.sort((a, b) => a - b));
+      }
+      if (!lists.length) {
+        return null;
+      }
+      lists.sort((a, b) => a.length - b.length);
+      let result = lists[0];
+      for (let i = 1; i < lists.length; i += 1) {
+        const allowed = new Set(lists[i]);
+        result = result.filter((idx) => allowed.has(idx));
+      }
+      return result;
+    };
+"""
+
+
 def build_filter_script():
     return """
-  <script>
+  <script>""" + build_match_rows_script() + """
     const tableFilter = document.getElementById('tableFilter');
     const caseFilter = document.getElementById('caseFilter');
-    if (tableFilter || caseFilter) {
+    const caseSearch = document.getElementById('caseSearch');
+    const portalIndex = window.PORTAL_INDEX;
+    if (portalIndex && (tableFilter || caseFilter || caseSearch)) {
+      const tbody = document.querySelector('.table-wrap tbody');
+      const rows = tbody.rows;
+      const filterStyle = document.createElement('style');
+      document.head.appendChild(filterStyle);
       const changeGroupHeader = document.getElementById('changeGroupHeader');
       const groupHeaderCells = document.querySelectorAll('th.group-header[data-group]');
-      const columnCells = document.querySelectorAll('th.sticky-top-3[data-group], td[data-group]');
+      let matched = [];
       const applyFilters = () => {
         const tableValue = tableFilter ? tableFilter.value : '';
         const caseValue = caseFilter ? caseFilter.value : '';
-        document.querySelectorAll('tbody tr').forEach((row) => {
-          const table = row.getAttribute('data-table') || '';
-          const caseId = row.getAttribute('data-case') || '';
-          const tableOk = (tableValue === '' || table === tableValue);
-          const caseOk = (caseValue === '' || caseId === caseValue);
-          row.style.display = (tableOk && caseOk) ? '' : 'none';
-        });
+        const searchValue = caseSearch ? caseSearch.value.trim() : '';
+        const visible = portalMatchRows(portalIndex, tableValue, caseValue, searchValue);
+        matched.forEach((idx) => rows[idx].classList.remove('match'));
+        matched = visible || [];
+        matched.forEach((idx) => rows[idx].classList.add('match'));
+        tbody.classList.toggle('filtered', visible !== null);
 
         const visibleGroups = new Map();
         groupHeaderCells.forEach((th) => {
@@ -684,11 +1327,19 @@ def build_filter_script():
           }
         });
 
-        columnCells.forEach((cell) => {
-          const group = cell.getAttribute('data-group') || '';
-          const visible = (tableValue === '' || group === tableValue);
-          cell.style.display = visible ? '' : 'none';
-        });
+        const hidden = [];
+        if (tableValue !== '') {
+          Object.keys(portalIndex.groups).forEach((group) => {
+            if (group === tableValue) {
+              return;
+            }
+            portalIndex.groups[group].forEach(([start, end]) => {
+              const range = `:nth-child(n+${portalIndex.fixed + start + 1}):nth-child(-n+${portalIndex.fixed + end})`;
+              hidden.push(`tbody td${range}`, `thead tr:nth-child(3) th${range}`);
+            });
+          });
+        }
+        filterStyle.textContent = hidden.length ? `${hidden.join(',')} { display: none; }` : '';
 
         if (changeGroupHeader) {
           let total = 0;
@@ -700,39 +1351,334 @@ def build_filter_script():
         }
       };
 
+      let searchTimer = null;
       if (tableFilter) {
         tableFilter.addEventListener('change', applyFilters);
       }
       if (caseFilter) {
         caseFilter.addEventListener('change', applyFilters);
       }
+      if (caseSearch) {
+        caseSearch.addEventListener('input', () => {
+          clearTimeout(searchTimer);
+          searchTimer = setTimeout(applyFilters, 150);
+        });
+      }
+    }
+""" + build_input_script() + """  </script>
+    """
+
+
+def build_navigation_script(navigation):
+    if not navigation:
+        return ""
+    return """
+  <script>
+    const shardNav = document.getElementById('shardNav');
+    if (shardNav) {
+      shardNav.addEventListener('change', () => {
+        if (shardNav.value) {
+          window.location.href = shardNav.value;
+        }
+      });
     }
+  </script>
+    """
+
+
+def build_virtual_script():
+    return """
+  <script>""" + build_match_rows_script() + """
+    (() => {
+      const data = window.PORTAL_DATA || { fixedClasses: [], groups: [], labels: [], starts: [], rows: [] };
+      const wrap = document.getElementById('tableWrap');
+      const tbody = document.getElementById('virtualBody');
+      const tableFilter = document.getElementById('tableFilter');
+      const caseFilter = document.getElementById('caseFilter');
+      const caseSearch = document.getElementById('caseSearch');
+      const changeGroupHeader = document.getElementById('changeGroupHeader');
+      const groupHeaderCells = document.querySelectorAll('th.group-header[data-group]');
+      const columnHeaderCells = document.querySelectorAll('th.sticky-top-3[data-group]');
+      const starts = new Set(data.starts);
+      const overscan = 10;
+      let rowHeight = 52;
+      let visibleRows = data.rows.map((_, idx) => idx);
+      let visibleCols = data.groups.map((_, idx) => idx);
+      let pending = false;
+
+      const esc = (text) => String(text)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#39;');
+
+      const renderChange = (row, col, kind, before, after) => {
+        const detail = esc(`${row[2]} / ${data.labels[col]}\\noperation: ${row[3]}\\ntrigger: ${row[4]}\\n詳細は後で追記`);
+        if (kind === 'current') {
+          return `<span class='change current'>${before}</span>`;
+        }
+        if (kind === 'before-changed') {
+          return `<span class='change before-changed detail-hover' data-detail='${detail}' title='${before}'>${after}</span>`;
+        }
+        if (kind === 'same') {
+          return `<span class='change same detail-hover' data-detail='${detail}'>${before}</span>`;
+        }
+        if (kind === 'added') {
+          return `<span class='change detail-hover' data-detail='${detail}'><span class='after added'>${after}</span></span>`;
+        }
+        return `<span class='change detail-hover' data-detail='${detail}'>`
+          + `<span class='before'>${before}</span><span class='arrow'>→</span>`
+          + `<span class='after ${kind}'>${after}</span></span>`;
+      };
+
+      const renderRow = (row) => {
+        const parts = [`<tr class='${row[0]}'>`];
+        row[5].forEach((html, idx) => {
+          parts.push(`<td class='${data.fixedClasses[idx]}'>${html}</td>`);
+        });
+        const cells = new Map();
+        for (let idx = 0; idx < row[6].length; idx += 4) {
+          cells.set(row[6][idx], idx);
+        }
+        visibleCols.forEach((col) => {
+          const start = starts.has(col) ? ' group-start' : '';
+          const pos = cells.get(col);
+          if (pos === undefined) {
+            parts.push(`<td class='empty${start}'></td>`);
+          } else {
+            const html = renderChange(row, col, row[6][pos + 1], row[6][pos + 2], row[6][pos + 3]);
+            parts.push(`<td class='${start.trim()}'>${html}</td>`);
+          }
+        });
+        parts.push('</tr>');
+        return parts.join('');
+      };
+
+      const draw = () => {
+        const total = visibleRows.length;
+        const span = data.fixedClasses.length + visibleCols.length;
+        const first = Math.max(0, Math.floor(wrap.scrollTop / rowHeight) - overscan);
+        const last = Math.min(total, Math.ceil((wrap.scrollTop + wrap.clientHeight) / rowHeight) + overscan);
+        const parts = [`<tr class='spacer'><td colspan='${span}' style='height: ${first * rowHeight}px'></td></tr>`];
+        if (first % 2 === 0) {
+          parts.push("<tr class='spacer'></tr>");
+        }
+        for (let idx = first; idx < last; idx += 1) {
+          parts.push(renderRow(data.rows[visibleRows[idx]]));
+        }
+        parts.push(`<tr class='spacer'><td colspan='${span}' style='height: ${(total - last) * rowHeight}px'></td></tr>`);
+        tbody.innerHTML = parts.join('');
+      };
+
+      const scheduleDraw = () => {
+        if (pending) {
+          return;
+        }
+        pending = true;
+        window.requestAnimationFrame(() => {
+          pending = false;
+          draw();
+        });
+      };
+
+      const applyFilters = () => {
+        const tableValue = tableFilter ? tableFilter.value : '';
+        const caseValue = caseFilter ? caseFilter.value : '';
+        const searchValue = caseSearch ? caseSearch.value.trim() : '';
+        const index = data.index || { tables: {}, cases: {} };
+        visibleRows = portalMatchRows(index, tableValue, caseValue, searchValue)
+          || data.rows.map((_, idx) => idx);
+        visibleCols = [];
+        data.groups.forEach((group, idx) => {
+          if (tableValue === '' || group === tableValue) {
+            visibleCols.push(idx);
+          }
+        });
+
+        const visibleGroups = new Map();
+        groupHeaderCells.forEach((th) => {
+          const group = th.getAttribute('data-group') || '';
+          const count = parseInt(th.getAttribute('data-count') || '0', 10);
+          const visible = (tableValue === '' || group === tableValue);
+          th.style.display = visible ? '' : 'none';
+          if (visible) {
+            visibleGroups.set(group, count);
+          }
+        });
+        columnHeaderCells.forEach((cell) => {
+          const group = cell.getAttribute('data-group') || '';
+          cell.style.display = (tableValue === '' || group === tableValue) ? '' : 'none';
+        });
+        if (changeGroupHeader) {
+          let total = 0;
+          visibleGroups.forEach((count) => { total += count; });
+          if (tableValue === '') {
+            total = parseInt(changeGroupHeader.getAttribute('data-count') || '0', 10);
+          }
+          changeGroupHeader.setAttribute('colspan', String(total));
+        }
 
+        wrap.scrollTop = 0;
+        draw();
+      };
+
+      draw();
+      const sample = tbody.querySelector('tr:not(.spacer)');
+      if (sample && sample.offsetHeight) {
+        rowHeight = sample.offsetHeight;
+        draw();
+      }
+      wrap.addEventListener('scroll', scheduleDraw);
+      window.addEventListener('resize', scheduleDraw);
+      if (tableFilter) {
+        tableFilter.addEventListener('change', applyFilters);
+      }
+      if (caseFilter) {
+        caseFilter.addEventListener('change', applyFilters);
+      }
+      let searchTimer = null;
+      if (caseSearch) {
+        caseSearch.addEventListener('input', () => {
+          clearTimeout(searchTimer);
+          searchTimer = setTimeout(applyFilters, 150);
+        });
+      }
+    })();
+""" + build_input_script() + """  </script>
+    """
+
+
+def build_input_script():
+    return """
     const inputSelector = document.getElementById('inputSelector');
     if (inputSelector) {
       inputSelector.addEventListener('change', () => {
+        if (inputSelector.dataset.navigate) {
+          window.location.href = inputSelector.value;
+          return;
+        }
         const hint = document.getElementById('inputHint');
         if (hint) {
           hint.textContent = '選択後は再生成が必要です';
         }
       });
     }
-  </script>
-    """
+"""
+
+
+def build_table_shards(events):
+    shards = []
+    by_table = {}
+    for event in events:
+        table = (event.table or "").strip()
+        shard = by_table.get(table)
+        if shard is None:
+            page = f"{SHARD_DIR}/table_{len(shards) + 1:03d}_{slugify(table)}.html"
+            shard = {"label": table or "(no table)", "page": page, "events": []}
+            by_table[table] = shard
+            shards.append(shard)
+        shard["events"].append(event)
+    return shards
+
+
+def build_case_shards(events, shard_size):
+    shards = []
+    case_shard = {}
+    for event in events:
+        shard = case_shard.get(event.case_id)
+        if shard is None:
+            if not shards or len(shards[-1]["cases"]) >= shard_size:
+                page = f"{SHARD_DIR}/cases_{len(shards) + 1:04d}.html"
+                shards.append({"label": "", "page": page, "events": [], "cases": []})
+            shard = shards[-1]
+            shard["cases"].append(event.case_id)
+            case_shard[event.case_id] = shard
+        shard["events"].append(event)
+    for shard in shards:
+        first, last = shard["cases"][0], shard["cases"][-1]
+        shard["label"] = first if first == last else f"{first} – {last}"
+    return shards
+
+
+def build_shard_navigation(shards, current_page, shard_by):
+    links = []
+    for shard in shards:
+        href = os.path.relpath(shard["page"], os.path.dirname(current_page))
+        links.append((shard["label"], href.replace(os.sep, "/"), shard["page"] == current_page))
+    index_href = "../" * current_page.count("/") + "index.html"
+    return {"shard_by": shard_by, "links": links, "index_href": index_href}
+
+
+def filter_columns(events, columns):
+    used = set()
+    for event in events:
+        used.update(event.changes)
+        for attr_id, value in materialize(event.current_values).items():
+            if value is not None:
+                used.add(attr_id)
+    registry = events.registry
+    return [col for col in columns if registry.lookup(col) in used]
+
+
+def fingerprint_page(events, columns, context):
+    key = events.registry.key
+    digest = hashlib.sha256()
+    digest.update(repr((context, columns)).encode("utf-8"))
+    for event in events:
+        changes = sorted(
+            (key(attr_id), change.before, change.after, change.note)
+            for attr_id, change in event.changes.items()
+        )
+        current_values = sorted(
+            (key(attr_id), value)
+            for attr_id, value in materialize(event.current_values).items()
+        )
+        digest.update(
+            repr(
+                (
+                    event.case_id,
+                    event.table,
+                    event.operation,
+                    event.trigger,
+                    event.sql,
+                    changes,
+                    current_values,
+                )
+            ).encode("utf-8")
+        )
+    return digest.hexdigest()
+
+
+def remove_stale_shards(shard_dir, written):
+    if not os.path.isdir(shard_dir):
+        return
+    keep = {os.path.basename(page) for page in written}
+    for name in os.listdir(shard_dir):
+        page = re.sub(r"\.(gz|br)$", "", name)
+        if page.endswith(".html") and page not in keep:
+            os.remove(os.path.join(shard_dir, name))
+
+
+def slugify(text):
+    slug = re.sub(r"[^A-Za-z0-9_-]+", "_", text).strip("_")
+    return slug or "none"
 
 
 def build_table_groups(events, columns):
     table_names = extract_table_names(events)
+    prefix_index = build_prefix_index(table_names)
 
-    grouped = []
-    used = set()
-    for table in table_names:
-        cols = [col for col in columns if resolve_group(col, table_names) == table]
-        if cols:
-            grouped.append((table, cols))
-            used.update(cols)
+    buckets = {table: [] for table in table_names}
+    leftover = []
+    for col in columns:
+        bucket = buckets.get(resolve_indexed_group(col, prefix_index))
+        if bucket is None:
+            leftover.append(col)
+        else:
+            bucket.append(col)
 
-    leftover = [col for col in columns if col not in used]
+    grouped = [(table, buckets[table]) for table in table_names if buckets[table]]
     if leftover:
         label = table_names[-1] if table_names else ""
         if grouped and grouped[-1][0] == label:
@@ -755,7 +1701,7 @@ def extract_table_names(events):
     table_names = []
     seen = set()
     for event in events:
-        table = (event.get("table") or "").strip()
+        table = (event.table or "").strip()
         if table and table not in seen:
             seen.add(table)
             table_names.append(table)
@@ -763,17 +1709,30 @@ def extract_table_names(events):
 
 
 def resolve_group(column, table_names):
+    return resolve_indexed_group(column, build_prefix_index(table_names))
+
+
+def build_prefix_index(table_names):
+    index = {}
+    for order, table in enumerate(table_names):
+        index.setdefault(f"{table}_", (order, table))
+        if table.endswith("s") and len(table) > 1:
+            index.setdefault(f"{table[:-1]}_", (order, table))
+    return index
+
+
+def resolve_indexed_group(column, prefix_index):
     table, _ = split_attr_key(column)
     if table:
         return table
-    for table in table_names:
-        prefixes = [f"{table}_"]
-        if table.endswith("s") and len(table) > 1:
-            prefixes.append(f"{table[:-1]}_")
-        for prefix in prefixes:
-            if column.startswith(prefix):
-                return table
-    return ""
+    best = None
+    pos = column.find("_")
+    while pos != -1:
+        match = prefix_index.get(column[: pos + 1])
+        if match is not None and (best is None or match[0] < best[0]):
+            best = match
+        pos = column.find("_", pos + 1)
+    return best[1] if best else ""
 
 
 def split_attr_key(column):
@@ -0,0 +1,3 @@
+# 出力HTMLの構造を変えたら上げる。ビルドキャッシュのキーに含めるので、
+# キャッシュ判定だけで済む再実行でレンダラ本体を import しなくて済むよう別モジュールに置く
+RENDERER_VERSION = "5"
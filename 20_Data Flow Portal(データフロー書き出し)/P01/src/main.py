@@ -1,18 +1,13 @@
 import argparse
 import os
 import sys
-import webbrowser
 
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
 
-from src.config_manager import ConfigManager
-from src.handlers.column_planner import plan_columns
-from src.handlers.context_filler import fill_context
-from src.handlers.csv_loader import load_csv
-from src.handlers.event_aggregator import aggregate_events
-from src.handlers.portal_renderer import PortalRenderer
+# パイプラインやサーバなどモード別の依存は、起動時間を抑えるため使う分岐の中で import する
+from src.config_manager import CONFIG_CACHE_DIR, ConfigManager
 from src.utils.errors import UserInputError
 from src.utils.log import setup_logger
 
@@ -23,45 +18,126 @@ def parse_args():
     parser.add_argument("--input", default=None)
     parser.add_argument("--output", default=None)
     parser.add_argument("--open", action="store_true")
+    parser.add_argument("--force", action="store_true")
+    parser.add_argument("--profile", action="store_true")
+    parser.add_argument("--batch", action="store_true")
+    parser.add_argument("--glob", default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--watch", action="store_true")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--serve", action="store_true")
+    parser.add_argument("--cache-size", type=int, default=4)
+    parser.add_argument("--diff", default=None)
+    parser.add_argument("--store", action="store_true")
     return parser.parse_args()
 
 
+def validate_args(args):
+    if args.workers is not None and args.workers < 1:
+        raise UserInputError("--workers は 1 以上の整数で指定してください。")
+
+
+def open_in_browser(index_path, enabled):
+    if enabled:
+        import webbrowser
+
+        webbrowser.open(f"file:///{os.path.abspath(index_path)}")
+
+
+def load_config(args):
+    config = ConfigManager(args.config, CONFIG_CACHE_DIR).load()
+    if args.input:
+        config["paths"]["input_csv"] = args.input
+    if args.output:
+        config["paths"]["output_dir"] = args.output
+        config["paths"]["assets_dir"] = os.path.join(args.output, "assets")
+    if args.store:
+        config.setdefault("store", {})["enabled"] = True
+    return config
+
+
+def watch(args, config, logger):
+    import webbrowser
+
+    from src.server import start_server
+    from src.watcher import PortalWatcher
+
+    server, reload_state = start_server(config["paths"]["output_dir"], port=args.port)
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    logger.info("serving: %s", url)
+    watcher = PortalWatcher(args.config, lambda: load_config(args), logger, reload_state)
+
+    def on_ready(index_path):
+        if args.open:
+            webbrowser.open(url)
+
+    try:
+        watcher.run(on_ready)
+    finally:
+        server.shutdown()
+
+
+def serve(args, config, logger):
+    import webbrowser
+
+    from src.server import PortalService, start_portal_server
+
+    server = start_portal_server(PortalService(config, args.cache_size), port=args.port)
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    logger.info("serving: %s", url)
+    if args.open:
+        webbrowser.open(url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("server stopped")
+    finally:
+        server.server_close()
+
+
 def main():
     args = parse_args()
     try:
-        config = ConfigManager(args.config).load()
-        if args.input:
-            config["paths"]["input_csv"] = args.input
-        if args.output:
-            config["paths"]["output_dir"] = args.output
-            config["paths"]["assets_dir"] = os.path.join(args.output, "assets")
+        validate_args(args)
+        config = load_config(args)
 
         logger = setup_logger(config["paths"]["log_dir"])
         logger.info("start rendering portal")
-        logger.info("input_csv=%s", config["paths"]["input_csv"])
         logger.info("output_dir=%s", config["paths"]["output_dir"])
 
-        rows = load_csv(
-            config["paths"]["input_csv"],
-            config["csv"]["required_columns"],
-        )
-        filled_rows = fill_context(
-            rows,
-            config["csv"]["carry_forward_columns"],
-            config["csv"]["required_columns"],
-        )
-        events = aggregate_events(filled_rows, config["csv"]["null_values"])
-        columns = plan_columns(
-            filled_rows,
-            config["display"].get("priority_columns", []),
-        )
-
-        renderer = PortalRenderer(config)
-        index_path = renderer.render(events, columns, config["paths"]["input_csv"])
-
-        logger.info("generated: %s", index_path)
-        if args.open:
-            webbrowser.open(f"file:///{os.path.abspath(index_path)}")
+        if args.serve:
+            serve(args, config, logger)
+            return
+        if args.watch:
+            watch(args, config, logger)
+            return
+        if args.batch or args.glob:
+            from src.batch import render_batch, resolve_batch_inputs
+
+            inputs = resolve_batch_inputs(config, args.glob)
+            logger.info("batch inputs=%d", len(inputs))
+            index_path = render_batch(
+                config,
+                inputs,
+                config["paths"]["output_dir"],
+                logger,
+                args.workers,
+                args.force,
+                args.profile,
+            )
+            logger.info("generated: %s", index_path)
+        elif args.diff:
+            from src.pipeline import build_diff_portal
+
+            logger.info("input_csv=%s", config["paths"]["input_csv"])
+            logger.info("compare_csv=%s", args.diff)
+            index_path = build_diff_portal(config, args.diff, logger, args.profile)
+        else:
+            from src.pipeline import build_portal
+
+            logger.info("input_csv=%s", config["paths"]["input_csv"])
+            index_path = build_portal(config, logger, args.force, args.profile)
+        open_in_browser(index_path, args.open)
     except UserInputError as exc:
         print(f"[INPUT ERROR] {exc}", file=sys.stderr)
         sys.exit(1)
@@ -0,0 +1,128 @@
+class ColumnRegistry:
+    """`table::attr_type` を連番の整数IDに変換して保持する。"""
+
+    __slots__ = ("_ids", "_by_key", "keys")
+
+    def __init__(self):
+        self._ids = {}
+        self._by_key = {}
+        self.keys = []
+
+    def __len__(self):
+        return len(self.keys)
+
+    def intern(self, table, attr_type):
+        attrs = self._ids.get(table)
+        if attrs is None:
+            attrs = self._ids[table] = {}
+        attr_id = attrs.get(attr_type)
+        if attr_id is None:
+            key = build_attr_key(table, attr_type)
+            attr_id = self._by_key.get(key)
+            if attr_id is None:
+                attr_id = len(self.keys)
+                self.keys.append(key)
+                self._by_key[key] = attr_id
+            attrs[attr_type] = attr_id
+        return attr_id
+
+    def lookup(self, key):
+        return self._by_key.get(key)
+
+    def key(self, attr_id):
+        return self.keys[attr_id]
+
+    def named(self, values):
+        return {self.keys[attr_id]: value for attr_id, value in values.items()}
+
+    def items(self):
+        return sorted(
+            (attr_id, table, attr_type)
+            for table, attrs in self._ids.items()
+            for attr_type, attr_id in attrs.items()
+        )
+
+    def merge(self, other):
+        mapping = [None] * len(other.keys)
+        for attr_id, table, attr_type in other.items():
+            mapping[attr_id] = self.intern(table, attr_type)
+        return mapping
+
+
+class Change:
+    __slots__ = ("before", "after", "note")
+
+    def __init__(self, before, after, note):
+        self.before = before
+        self.after = after
+        self.note = note
+
+    def get(self, name, default=None):
+        return getattr(self, name, default)
+
+    def __eq__(self, other):
+        if not isinstance(other, Change):
+            return NotImplemented
+        return (self.before, self.after, self.note) == (other.before, other.after, other.note)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Change({self.before!r}, {self.after!r}, {self.note!r})"
+
+
+class Event:
+    __slots__ = (
+        "case_id",
+        "table",
+        "operation",
+        "trigger",
+        "sql",
+        "changes",
+        "current_values",
+    )
+
+    def __init__(self, case_id, table, operation, trigger, sql, current_values):
+        self.case_id = case_id
+        self.table = table
+        self.operation = operation
+        self.trigger = trigger
+        self.sql = sql
+        self.changes = {}
+        self.current_values = current_values
+
+    def get(self, name, default=None):
+        if name in Event.__slots__:
+            return getattr(self, name)
+        return default
+
+    def __getitem__(self, name):
+        if name in Event.__slots__:
+            return getattr(self, name)
+        raise KeyError(name)
+
+    def __eq__(self, other):
+        if not isinstance(other, Event):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in Event.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Event({self.case_id!r}, {self.table!r}, changes={len(self.changes)})"
+
+
+class EventLog(list):
+    """集約済みイベントの一覧。列IDの registry、列ごとの出現数、テーブルごとの最新状態、
+    列ごとの変更イベント位置（lineage、位置の昇順）を一緒に持つ。"""
+
+    def __init__(self, events=(), registry=None):
+        super().__init__(events)
+        self.registry = registry if registry is not None else ColumnRegistry()
+        self.column_counts = {}
+        self.latest_by_table = {}
+        self.lineage = {}
+
+
+def build_attr_key(table, attr_type):
+    return f"{table}::{attr_type}"
@@ -0,0 +1,248 @@
+import copy
+import os
+
+from src.handlers.column_planner import plan_event_columns
+from src.handlers.context_filler import fill_columns, fill_context, iter_fill_context
+from src.handlers.csv_loader import PARQUET_EXTENSIONS, iter_csv, load_columns, load_csv
+from src.handlers.event_aggregator import aggregate_columns, aggregate_events
+from src.handlers.renderer_version import RENDERER_VERSION
+from src.utils.build_cache import BuildCache, build_key
+from src.utils.nulls import build_null_matcher
+from src.utils.profiler import StageProfiler
+
+
+def row_cache_dir(config):
+    if config["csv"].get("row_cache", False):
+        return config["csv"].get("row_cache_dir") or None
+    return None
+
+
+def stream_rows(config):
+    rows = iter_csv(
+        config["paths"]["input_csv"],
+        config["csv"]["required_columns"],
+        row_cache_dir(config),
+    )
+    return iter_fill_context(
+        rows,
+        config["csv"]["carry_forward_columns"],
+        config["csv"]["required_columns"],
+    )
+
+
+def build_portal(config, logger, force=False, profile=False, input_links=None):
+    input_csv = config["paths"]["input_csv"]
+    cache = BuildCache(config["paths"]["output_dir"])
+    event_store = event_store_path(config)
+    current_key = None
+    if os.path.exists(input_csv):
+        current_key = build_key(input_csv, config, RENDERER_VERSION)
+        if not force and cache.is_fresh(current_key):
+            index_path = cache.index_path
+            logger.info("no changes, skipped: %s", index_path)
+            return index_path
+
+    # レンダラは重いので、キャッシュで済まなかったときだけ読み込む
+    from src.handlers.portal_renderer import PortalRenderer
+
+    profiler = StageProfiler(profile)
+    profiler.start()
+    null_matcher = build_null_matcher(config["csv"]["null_values"])
+    events = ingest_events(config, null_matcher, profiler)
+    renderer = PortalRenderer(config, null_matcher)
+    if input_links:
+        renderer.input_links = input_links
+    if not force:
+        renderer.previous_pages = cache.pages
+    index_path = render_events(config, events, renderer, profiler)
+    outputs = list(renderer.outputs)
+    if event_store:
+        from src.handlers.event_store import write_event_store
+
+        with profiler.stage("event_store") as stage:
+            write_event_store(event_store, events, input_csv)
+            stage["events"] = len(events)
+        logger.info("event store written: %s", event_store)
+        outputs.append(event_store)
+    if current_key:
+        cache.save(current_key, renderer.page_hashes, outputs)
+
+    profile_path = profiler.report(
+        logger,
+        config["paths"]["output_dir"],
+        input_csv=input_csv,
+    )
+    if profile_path:
+        logger.info("profile written: %s", profile_path)
+    if renderer.skipped_pages:
+        logger.info("unchanged pages skipped: %d", len(renderer.skipped_pages))
+    log_size_report(logger, renderer.size_report)
+    logger.info("generated: %s", index_path)
+    return index_path
+
+
+def event_store_path(config):
+    store = config.get("store", {})
+    if not store.get("enabled", False):
+        return None
+    from src.handlers.event_store import store_path
+
+    return store_path(config["paths"]["output_dir"], store.get("filename"))
+
+
+def ingest_events(config, null_matcher, profiler=None, registry=None):
+    profiler = profiler or StageProfiler()
+    if config["csv"].get("streaming", False):
+        with profiler.stage("ingest") as stage:
+            rows = profiler.count(stage, "rows", stream_rows(config))
+            events = aggregate_events(rows, null_matcher, registry)
+            stage["events"] = len(events)
+        return events
+
+    workers = config["csv"].get("parallel_workers", 0) or 0
+    # 差分モードは共有レジストリへ直接積む必要があり、Parquet / 行キャッシュは CSV として分割できないので直列経路を使う
+    if workers > 1 and registry is None and not columnar_input(config):
+        # multiprocessing / sqlite3 の読込は起動時間に効くので、並列読込とイベントストアは使うときだけ import する
+        from src.handlers.parallel_loader import ChunkOverlapError, parallel_ingest
+
+        with profiler.stage("parallel_ingest") as stage:
+            stage["workers"] = workers
+            try:
+                events = parallel_ingest(
+                    config["paths"]["input_csv"],
+                    config["csv"],
+                    workers,
+                    int(config["csv"].get("parallel_chunk_mb", 64)) * 1024 * 1024,
+                )
+                stage["events"] = len(events)
+            except ChunkOverlapError:
+                # case がチャンクをまたいで再登場する入力は直列で集約し直す
+                stage["fallback"] = "serial"
+                events = None
+        if events is not None:
+            return events
+
+    if config["csv"].get("fill_engine", "python") == "pandas" and columnar_input(config):
+        events = ingest_columns(config, null_matcher, profiler, registry)
+        if events is not None:
+            return events
+
+    with profiler.stage("load_csv") as stage:
+        rows = load_csv(
+            config["paths"]["input_csv"],
+            config["csv"]["required_columns"],
+            row_cache_dir(config),
+        )
+        stage["rows"] = len(rows)
+    with profiler.stage("fill_context") as stage:
+        rows = fill_context(
+            rows,
+            config["csv"]["carry_forward_columns"],
+            config["csv"]["required_columns"],
+        )
+        stage["rows"] = len(rows)
+    with profiler.stage("aggregate_events") as stage:
+        events = aggregate_events(rows, null_matcher, registry)
+        stage["events"] = len(events)
+    return events
+
+
+def columnar_input(config):
+    # 行キャッシュ / Parquet は列のまま読める。素の CSV は解析が支配的で、列にしても速くならない
+    if row_cache_dir(config):
+        return True
+    return config["paths"]["input_csv"].lower().endswith(PARQUET_EXTENSIONS)
+
+
+def ingest_columns(config, null_matcher, profiler, registry=None):
+    # 読込→補完→集約を列タプルのまま通し、行 dict を作らない
+    with profiler.stage("load_columns") as stage:
+        table = load_columns(
+            config["paths"]["input_csv"],
+            config["csv"]["required_columns"],
+            row_cache_dir(config),
+        )
+        if table is None:
+            # ヘッダより列の多い行は列に揃えられないので、行単位の経路で読み直す
+            stage["fallback"] = "rows"
+            return None
+        fieldnames, columns = table
+        stage["rows"] = len(columns[0])
+    with profiler.stage("fill_context") as stage:
+        columns = fill_columns(
+            fieldnames,
+            columns,
+            config["csv"]["carry_forward_columns"],
+            config["csv"]["required_columns"],
+        )
+        stage["rows"] = len(columns[0])
+    with profiler.stage("aggregate_events") as stage:
+        events = aggregate_columns(fieldnames, columns, null_matcher, registry)
+        stage["events"] = len(events)
+    return events
+
+
+def build_diff_portal(config, compare_csv, logger, profile=False):
+    from src.handlers.event_differ import diff_events
+    from src.handlers.portal_renderer import PortalRenderer
+
+    profiler = StageProfiler(profile)
+    profiler.start()
+    null_matcher = build_null_matcher(config["csv"]["null_values"])
+    base = ingest_events(config, null_matcher, profiler)
+    compare_config = copy.deepcopy(config)
+    compare_config["paths"]["input_csv"] = compare_csv
+    target = ingest_events(compare_config, null_matcher, profiler, base.registry)
+    with profiler.stage("diff_events") as stage:
+        events = diff_events(base, target)
+        stage["events"] = len(events)
+    logger.info(
+        "diff: base=%d events, target=%d events, differing=%d",
+        len(base),
+        len(target),
+        len(events),
+    )
+
+    # 差分ページで通常ビルドの出力を上書きするので、次の通常ビルドが「変更なし」と判定しないよう記録を消す
+    BuildCache(config["paths"]["output_dir"]).clear()
+    renderer = PortalRenderer(config, null_matcher)
+    renderer.compare_csv = compare_csv
+    index_path = render_events(config, events, renderer, profiler)
+    profile_path = profiler.report(
+        logger,
+        config["paths"]["output_dir"],
+        input_csv=config["paths"]["input_csv"],
+        compare_csv=compare_csv,
+    )
+    if profile_path:
+        logger.info("profile written: %s", profile_path)
+    log_size_report(logger, renderer.size_report)
+    logger.info("generated: %s", index_path)
+    return index_path
+
+
+def log_size_report(logger, report):
+    if not report:
+        return
+    from src.utils.compress import COMPRESS_SUFFIXES, format_size
+
+    for entry in report["files"] + [dict(report["total"], path="(total)")]:
+        parts = [f"{entry['path']}: {format_size(entry['bytes'])}"]
+        for fmt in COMPRESS_SUFFIXES:
+            if fmt in entry:
+                parts.append(f"{fmt} {format_size(entry[fmt])}")
+        logger.info("size %s", " / ".join(parts))
+
+
+def render_events(config, events, renderer, profiler=None):
+    profiler = profiler or StageProfiler()
+    with profiler.stage("plan_columns") as stage:
+        columns = plan_event_columns(
+            events,
+            config["display"].get("priority_columns", []),
+        )
+        stage["columns"] = len(columns)
+    with profiler.stage("render") as stage:
+        index_path = renderer.render(events, columns, config["paths"]["input_csv"])
+        stage["events"] = len(events)
+    return index_path
@@ -0,0 +1,314 @@
+import copy
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import partial
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+
+from src.handlers.column_planner import plan_event_columns
+from src.handlers.portal_renderer import PortalRenderer, build_css
+from src.pipeline import ingest_events
+from src.utils.errors import UserInputError
+from src.utils.fs import ensure_dir, file_signature
+from src.utils.nulls import build_null_matcher
+
+
+RELOAD_PATH = "/__reload"
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+RELOAD_SCRIPT = """
+  <script>
+    (() => {
+      let version = null;
+      const poll = () => {
+        fetch('%s?v=' + (version || ''))
+          .then((res) => res.json())
+          .then((data) => {
+            if (version !== null && data.version !== version) {
+              window.location.reload();
+              return;
+            }
+            version = data.version;
+            setTimeout(poll, 0);
+          })
+          .catch(() => setTimeout(poll, 1000));
+      };
+      poll();
+    })();
+  </script>
+""" % RELOAD_PATH
+
+
+class ReloadState:
+    def __init__(self):
+        self.version = 0
+        self.changed = threading.Condition()
+
+    def bump(self):
+        with self.changed:
+            self.version += 1
+            self.changed.notify_all()
+
+    def wait(self, known, timeout=25):
+        with self.changed:
+            if known == self.version:
+                self.changed.wait(timeout)
+            return self.version
+
+
+class ReloadHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, reload_state=None, **kwargs):
+        self.reload_state = reload_state
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == RELOAD_PATH:
+            known = parse_qs(url.query).get("v", [""])[0]
+            known = int(known) if known.isdigit() else None
+            self.send_body(
+                json.dumps({"version": self.reload_state.wait(known)}).encode("utf-8"),
+                "application/json",
+            )
+            return
+
+        path = self.translate_path(url.path)
+        if os.path.isdir(path):
+            path = os.path.join(path, "index.html")
+        if path.endswith(".html") and os.path.isfile(path):
+            with open(path, "r", encoding="utf-8") as f:
+                html = f.read()
+            html = inject_reload_script(html)
+            self.send_body(html.encode("utf-8"), "text/html; charset=utf-8")
+            return
+        if self.send_precompressed(path):
+            return
+        super().do_GET()
+
+    def send_precompressed(self, path):
+        # HTML はリロード用スクリプトを差し込むため対象外。
+        # .br/.gz は元ファイルと同じ更新時刻のもの（compress_file が付ける）だけ使う
+        accepted = self.headers.get("Accept-Encoding", "")
+        signature = file_signature(path)
+        if signature is None:
+            return False
+        for encoding, suffix in PRECOMPRESSED:
+            sibling_signature = file_signature(path + suffix)
+            if encoding not in accepted or sibling_signature is None:
+                continue
+            if sibling_signature[0] != signature[0]:
+                continue
+            with open(path + suffix, "rb") as f:
+                body = f.read()
+            self.send_body(body, self.guess_type(path), encoding)
+            return True
+        return False
+
+    def send_body(self, body, content_type, encoding=None):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+            self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def inject_reload_script(html):
+    index = html.rfind("</body>")
+    if index < 0:
+        return html + RELOAD_SCRIPT
+    return html[:index] + RELOAD_SCRIPT + html[index:]
+
+
+def start_server(directory, host="127.0.0.1", port=8765, reload_state=None):
+    ensure_dir(directory)
+    reload_state = reload_state or ReloadState()
+    handler = partial(ReloadHandler, directory=directory, reload_state=reload_state)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, reload_state
+
+
+class EventCache:
+    def __init__(self, load, capacity=4):
+        self.load = load
+        self.capacity = max(1, capacity)
+        self.entries = OrderedDict()
+        self.loading = {}
+        self.lock = threading.Lock()
+
+    def get(self, path):
+        key = (path, file_signature(path))
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+            pending = self.loading.get(key)
+            owner = pending is None
+            if owner:
+                pending = self.loading[key] = Future()
+        if not owner:
+            # 同じ入力を読込中のリクエストは、その結果を待つ（読込は1回だけ）
+            return pending.result()
+
+        # 重い読込はロックの外で行い、他の入力へのリクエストを止めない
+        try:
+            value = self.load(path)
+        except BaseException as exc:
+            with self.lock:
+                del self.loading[key]
+            pending.set_exception(exc)
+            raise
+        with self.lock:
+            del self.loading[key]
+            for stale in [entry for entry in self.entries if entry[0] == path]:
+                del self.entries[stale]
+            self.entries[key] = value
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+        pending.set_result(value)
+        return value
+
+
+class PortalService:
+    def __init__(self, config, capacity=4):
+        self.config = config
+        self.candidates = list(config["display"].get("input_candidates", []))
+        if config["paths"]["input_csv"] not in self.candidates:
+            self.candidates.insert(0, config["paths"]["input_csv"])
+        self.null_matcher = build_null_matcher(config["csv"]["null_values"])
+        self.cache = EventCache(self.load, capacity)
+
+    def resolve_input(self, requested):
+        if not requested:
+            return self.candidates[0]
+        if requested not in self.candidates:
+            raise LookupError(requested)
+        return requested
+
+    def build_config(self, input_csv):
+        config = copy.deepcopy(self.config)
+        config["paths"]["input_csv"] = input_csv
+        config["display"]["input_candidates"] = self.candidates
+        return config
+
+    def load(self, input_csv):
+        config = self.build_config(input_csv)
+        events = ingest_events(config, self.null_matcher)
+        columns = plan_event_columns(events, config["display"].get("priority_columns", []))
+        return events, columns
+
+    def build_renderer(self, input_csv):
+        renderer = PortalRenderer(self.build_config(input_csv), self.null_matcher)
+        renderer.input_links = {path: input_href("/", path) for path in self.candidates}
+        return renderer
+
+    def iter_page(self, input_csv):
+        events, columns = self.cache.get(input_csv)
+        renderer = self.build_renderer(input_csv)
+        if self.config["display"].get("render_mode", "table") == "virtual":
+            return [
+                renderer.build_virtual_html(
+                    events,
+                    columns,
+                    input_csv,
+                    "/assets/style.css",
+                    input_href("/assets/events.js", input_csv),
+                    input_links=renderer.build_input_links(""),
+                )
+            ]
+        return renderer.iter_html(
+            events,
+            columns,
+            input_csv,
+            "/assets/style.css",
+            input_links=renderer.build_input_links(""),
+        )
+
+    def iter_virtual_data(self, input_csv):
+        events, columns = self.cache.get(input_csv)
+        return self.build_renderer(input_csv).iter_virtual_data(events, columns)
+
+    def iter_table_json(self, input_csv):
+        events, columns = self.cache.get(input_csv)
+        return self.build_renderer(input_csv).iter_table_json(events, columns)
+
+
+class PortalHandler(BaseHTTPRequestHandler):
+    def __init__(self, *args, service=None, **kwargs):
+        self.service = service
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        routes = {
+            "/": (self.service.iter_page, "text/html; charset=utf-8"),
+            "/index.html": (self.service.iter_page, "text/html; charset=utf-8"),
+            "/assets/events.js": (
+                self.service.iter_virtual_data,
+                "application/javascript; charset=utf-8",
+            ),
+            "/api/table": (self.service.iter_table_json, "application/json; charset=utf-8"),
+        }
+        if url.path == "/assets/style.css":
+            self.send_chunks([build_css()], "text/css; charset=utf-8")
+            return
+        if url.path == "/api/inputs":
+            body = json.dumps({"inputs": self.service.candidates}, ensure_ascii=False)
+            self.send_chunks([body], "application/json; charset=utf-8")
+            return
+        if url.path not in routes:
+            self.send_error_json(404, "not found")
+            return
+
+        build, content_type = routes[url.path]
+        try:
+            input_csv = self.service.resolve_input(parse_qs(url.query).get("input", [""])[0])
+            chunks = build(input_csv)
+        except LookupError as exc:
+            self.send_error_json(404, f"unknown input: {exc.args[0]}")
+            return
+        except UserInputError as exc:
+            self.send_error_json(400, str(exc))
+            return
+        self.send_chunks(chunks, content_type)
+
+    def send_chunks(self, chunks, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        for chunk in chunks:
+            self.wfile.write(chunk.encode("utf-8"))
+
+    def send_error_json(self, status, message):
+        body = json.dumps({"error": message}, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def input_href(path, input_csv):
+    return f"{path}?input={quote(input_csv)}"
+
+
+def start_portal_server(service, host="127.0.0.1", port=8765):
+    handler = partial(PortalHandler, service=service)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
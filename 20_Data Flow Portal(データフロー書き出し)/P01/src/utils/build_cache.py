@@ -0,0 +1,85 @@
+import hashlib
+import json
+import os
+
+from src.utils.fs import write_text
+
+
+CACHE_NAME = ".build_cache.json"
+
+
+class BuildCache:
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, CACHE_NAME)
+        self.data = self._load()
+
+    @property
+    def index_path(self):
+        return os.path.join(self.output_dir, "index.html")
+
+    @property
+    def pages(self):
+        return self.data.get("pages", {})
+
+    @property
+    def outputs(self):
+        return self.data.get("outputs", [])
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def is_fresh(self, build_key):
+        if self.data.get("build_key") != build_key:
+            return False
+        if not os.path.exists(self.index_path):
+            return False
+        return all(
+            os.path.exists(os.path.join(self.output_dir, *path.split("/")))
+            for path in list(self.pages) + self.outputs
+        )
+
+    def clear(self):
+        self.data = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def save(self, build_key, pages, outputs=()):
+        # outputs: ページ以外も含め、生成したファイルのパス（出力先からの相対パスで保存する）
+        self.data = {
+            "build_key": build_key,
+            "pages": pages,
+            "outputs": sorted(
+                {
+                    os.path.relpath(path, self.output_dir).replace(os.sep, "/")
+                    for path in outputs
+                }
+            ),
+        }
+        write_text(self.path, json.dumps(self.data, ensure_ascii=False, indent=2))
+
+
+def build_key(input_csv, config, renderer_version):
+    digest = hashlib.sha256()
+    digest.update(f"renderer={renderer_version}\n".encode("utf-8"))
+    digest.update(
+        json.dumps(config, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    )
+    digest.update(b"\n")
+    digest.update(hash_file(input_csv).encode("ascii"))
+    return digest.hexdigest()
+
+
+def hash_file(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
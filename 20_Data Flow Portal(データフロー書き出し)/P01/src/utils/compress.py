@@ -0,0 +1,85 @@
+import gzip
+import os
+
+from src.utils.errors import UserInputError
+from src.utils.fs import atomic_open
+
+
+COMPRESS_SUFFIXES = {"gzip": ".gz", "brotli": ".br"}
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 7
+BLOCK_SIZE = 1024 * 1024
+
+
+def compress_outputs(paths, formats):
+    written = []
+    for path in paths:
+        for fmt in formats:
+            sibling = compress_file(path, fmt)
+            if sibling:
+                written.append(sibling)
+    return written
+
+
+def compress_file(path, fmt):
+    # 元ファイルと同じ更新時刻を付けておき、次回は時刻が一致すれば圧縮を省く
+    source = os.stat(path)
+    sibling = path + COMPRESS_SUFFIXES[fmt]
+    if os.path.exists(sibling) and os.stat(sibling).st_mtime_ns == source.st_mtime_ns:
+        return None
+    if fmt == "brotli":
+        write_brotli(path, sibling)
+    else:
+        write_gzip(path, sibling)
+    os.utime(sibling, ns=(source.st_atime_ns, source.st_mtime_ns))
+    return sibling
+
+
+def write_gzip(path, sibling):
+    with open(path, "rb") as src, atomic_open(sibling, "wb") as dst:
+        with gzip.GzipFile(
+            filename="", mode="wb", fileobj=dst, compresslevel=GZIP_LEVEL, mtime=0
+        ) as gz:
+            for block in iter(lambda: src.read(BLOCK_SIZE), b""):
+                gz.write(block)
+
+
+def write_brotli(path, sibling):
+    try:
+        import brotli
+    except ImportError as exc:
+        raise UserInputError(
+            "output.compress に brotli を指定するには brotli が必要です。pip install brotli を実行してください。"
+        ) from exc
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    with open(path, "rb") as src, atomic_open(sibling, "wb") as dst:
+        for block in iter(lambda: src.read(BLOCK_SIZE), b""):
+            dst.write(compressor.process(block))
+        dst.write(compressor.finish())
+
+
+def build_size_report(output_dir, paths):
+    files = []
+    totals = {"bytes": 0}
+    for path in sorted(set(paths)):
+        if not os.path.exists(path):
+            continue
+        entry = {
+            "path": os.path.relpath(path, output_dir).replace(os.sep, "/"),
+            "bytes": os.path.getsize(path),
+        }
+        totals["bytes"] += entry["bytes"]
+        for fmt, suffix in COMPRESS_SUFFIXES.items():
+            if os.path.exists(path + suffix):
+                entry[fmt] = os.path.getsize(path + suffix)
+                totals[fmt] = totals.get(fmt, 0) + entry[fmt]
+        files.append(entry)
+    return {"files": files, "total": totals}
+
+
+def format_size(size):
+    if size >= 1024 * 1024:
+        return f"{size / 1024 / 1024:.1f}MB"
+    if size >= 1024:
+        return f"{size / 1024:.1f}KB"
+    return f"{size}B"
@@ -1,4 +1,5 @@
 import os
+from contextlib import contextmanager
 
 
 def ensure_dir(path):
@@ -6,13 +7,47 @@ def ensure_dir(path):
         os.makedirs(path, exist_ok=True)
 
 
-def write_text(path, text, encoding="utf-8"):
+@contextmanager
+def atomic_open(path, mode="w", encoding=None, buffering=-1):
     ensure_dir(os.path.dirname(path))
-    with open(path, "w", encoding=encoding) as f:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, mode, encoding=encoding, buffering=buffering) as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_text(path, text, encoding="utf-8"):
+    with atomic_open(path, "w", encoding=encoding) as f:
         f.write(text)
 
 
+def write_chunks(path, chunks, encoding="utf-8", buffer_size=1024 * 1024):
+    with atomic_open(path, "w", encoding=encoding, buffering=buffer_size) as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+
 def write_bytes(path, data):
-    ensure_dir(os.path.dirname(path))
-    with open(path, "wb") as f:
+    with atomic_open(path, "wb") as f:
         f.write(data)
+
+
+def write_text_if_changed(path, text, encoding="utf-8"):
+    if os.path.exists(path):
+        with open(path, "r", encoding=encoding) as f:
+            if f.read() == text:
+                return False
+    write_text(path, text, encoding)
+    return True
+
+
+def file_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
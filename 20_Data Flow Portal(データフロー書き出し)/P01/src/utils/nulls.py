@@ -0,0 +1,32 @@
+class NullMatcher:
+    __slots__ = ("tokens", "match")
+
+    def __init__(self, null_values):
+        self.tokens = frozenset(str(v).lower() for v in null_values)
+        self.match = compile_null_match(null_values, self.tokens)
+
+    def __call__(self, value):
+        return self.match(value)
+
+
+def compile_null_match(null_values, tokens):
+    exact = frozenset(
+        text for text in (str(v) for v in null_values) if text.strip().lower() in tokens
+    ) | {""}
+
+    def match(value):
+        if value in exact or value is None:
+            return True
+        if value.__class__ is str:
+            text = value.strip()
+        else:
+            text = str(value).strip()
+        return text == "" or text.lower() in tokens
+
+    return match
+
+
+def build_null_matcher(null_values):
+    if isinstance(null_values, NullMatcher):
+        return null_values
+    return NullMatcher(null_values or [])
@@ -0,0 +1,106 @@
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+from src.utils.fs import ensure_dir
+
+
+PROFILE_NAME = "profile.jsonl"
+
+
+class StageProfiler:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.stages = []
+        self._started = None
+
+    def start(self):
+        if not self.enabled:
+            return
+        self._started = (time.perf_counter(), time.process_time())
+        tracemalloc.start()
+
+    def stop(self):
+        if self.enabled and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield {}
+            return
+        record = {"stage": name}
+        tracemalloc.reset_peak()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_sec"] = round(time.perf_counter() - wall, 4)
+            record["cpu_sec"] = round(time.process_time() - cpu, 4)
+            record["peak_mem_mb"] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 2)
+            self.stages.append(record)
+
+    def count(self, record, key, iterable):
+        if not self.enabled:
+            return iterable
+        return _counted(record, key, iterable)
+
+    def summary(self):
+        total = {}
+        if self._started:
+            total = {
+                "wall_sec": round(time.perf_counter() - self._started[0], 4),
+                "cpu_sec": round(time.process_time() - self._started[1], 4),
+            }
+        return {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "total": total,
+            "stages": self.stages,
+        }
+
+    def report(self, logger, output_dir, **extra):
+        if not self.enabled:
+            return None
+        self.stop()
+        summary = self.summary()
+        summary.update(extra)
+        for record in self.stages:
+            logger.info(
+                "profile %s: wall=%.3fs cpu=%.3fs peak=%.1fMB%s",
+                record["stage"],
+                record["wall_sec"],
+                record["cpu_sec"],
+                record["peak_mem_mb"],
+                _format_counts(record),
+            )
+        if summary["total"]:
+            logger.info(
+                "profile total: wall=%.3fs cpu=%.3fs",
+                summary["total"]["wall_sec"],
+                summary["total"]["cpu_sec"],
+            )
+        ensure_dir(output_dir)
+        path = os.path.join(output_dir, PROFILE_NAME)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(summary, ensure_ascii=False) + "\n")
+        return path
+
+
+def _counted(record, key, iterable):
+    record[key] = 0
+    for item in iterable:
+        record[key] += 1
+        yield item
+
+
+def _format_counts(record):
+    counts = [
+        f"{key}={record[key]}"
+        for key in ("rows", "events", "columns")
+        if key in record
+    ]
+    return (" " + " ".join(counts)) if counts else ""
@@ -0,0 +1,91 @@
+from collections.abc import Mapping
+
+
+_MISSING = object()
+
+
+class Snapshot(Mapping):
+    """自身の差分と直前状態（親）への参照だけを持つ copy-on-write マップ。
+
+    親として参照された時点で sealed になり、以後は書き換えない。
+    """
+
+    __slots__ = ("_values", "_parent", "_depth", "_sealed")
+
+    max_depth = 16
+
+    def __init__(self, parent=None):
+        self._sealed = False
+        if parent is None:
+            self._values = {}
+            self._parent = None
+            self._depth = 0
+        elif parent._depth >= self.max_depth:
+            parent._sealed = True
+            self._values = parent.to_dict()
+            self._parent = None
+            self._depth = 0
+        else:
+            parent._sealed = True
+            self._values = {}
+            self._parent = parent
+            self._depth = parent._depth + 1
+
+    @property
+    def sealed(self):
+        return self._sealed
+
+    def __setitem__(self, key, value):
+        if self._sealed:
+            raise TypeError("sealed snapshot cannot be modified")
+        self._values[key] = value
+
+    def __getitem__(self, key):
+        node = self
+        while node is not None:
+            value = node._values.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            node = node._parent
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        node = self
+        while node is not None:
+            value = node._values.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            node = node._parent
+        return default
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self):
+        return iter(self.to_dict())
+
+    def __len__(self):
+        return len(self.to_dict())
+
+    def __repr__(self):
+        return f"Snapshot({self.to_dict()!r})"
+
+    def own_items(self):
+        return self._values.items()
+
+    def to_dict(self):
+        chain = []
+        node = self
+        while node is not None:
+            chain.append(node._values)
+            node = node._parent
+        merged = {}
+        for values in reversed(chain):
+            merged.update(values)
+        return merged
+
+
+def materialize(values):
+    if isinstance(values, Snapshot):
+        return values.to_dict()
+    return values or {}
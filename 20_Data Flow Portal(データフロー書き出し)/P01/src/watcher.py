@@ -0,0 +1,102 @@
+import json
+import time
+
+from src.handlers.portal_renderer import PortalRenderer
+from src.pipeline import ingest_events, render_events
+from src.utils.build_cache import BuildCache
+from src.utils.errors import UserInputError
+from src.utils.fs import file_signature
+from src.utils.nulls import build_null_matcher
+
+
+class PortalWatcher:
+    def __init__(self, config_path, load_config, logger, reload_state=None, interval=0.3):
+        self.config_path = config_path
+        self.load_config = load_config
+        self.logger = logger
+        self.reload_state = reload_state
+        self.interval = interval
+        self.config = None
+        self.ingest_key = None
+        self.events = None
+        self.null_matcher = None
+        self.page_hashes = {}
+        self.watched = {}
+
+    def build(self):
+        started = time.perf_counter()
+        config = self.load_config()
+        self.config = config
+        ingest_key = build_ingest_key(config)
+        if ingest_key != self.ingest_key:
+            self.null_matcher = build_null_matcher(config["csv"]["null_values"])
+            self.events = ingest_events(config, self.null_matcher)
+            self.ingest_key = ingest_key
+            reused = False
+        else:
+            reused = True
+
+        # 監視中の出力は通常ビルドの記録と一致しなくなるので、次の通常ビルドで作り直させる
+        BuildCache(config["paths"]["output_dir"]).clear()
+        renderer = PortalRenderer(config, self.null_matcher)
+        renderer.previous_pages = self.page_hashes
+        index_path = render_events(config, self.events, renderer)
+        self.page_hashes = renderer.page_hashes
+        if self.reload_state is not None:
+            self.reload_state.bump()
+        self.logger.info(
+            "rebuilt in %.3fs (events %s): %s",
+            time.perf_counter() - started,
+            "reused" if reused else "reloaded",
+            index_path,
+        )
+        return index_path
+
+    def watched_paths(self):
+        paths = [self.config_path]
+        if self.config:
+            paths.append(self.config["paths"]["input_csv"])
+        return paths
+
+    def poll(self):
+        current = {path: file_signature(path) for path in self.watched_paths()}
+        changed = current != self.watched
+        self.watched = current
+        return changed
+
+    def rebuild_safely(self):
+        self.poll()
+        try:
+            return self.build()
+        except UserInputError as exc:
+            self.logger.error("[INPUT ERROR] %s", exc)
+            self.ingest_key = None
+            return None
+        finally:
+            # 入力パスが設定変更で切り替わった場合に備え、ビルド前の状態を引き継いで監視対象を更新する
+            self.watched = {
+                path: self.watched.get(path, file_signature(path))
+                for path in self.watched_paths()
+            }
+
+    def run(self, on_ready=None):
+        index_path = self.rebuild_safely()
+        if on_ready:
+            on_ready(index_path)
+        self.logger.info("watching: %s", ", ".join(self.watched_paths()))
+        try:
+            while True:
+                time.sleep(self.interval)
+                if self.poll():
+                    self.rebuild_safely()
+        except KeyboardInterrupt:
+            self.logger.info("watch stopped")
+
+
+def build_ingest_key(config):
+    input_csv = config["paths"]["input_csv"]
+    return (
+        input_csv,
+        file_signature(input_csv),
+        json.dumps(config["csv"], sort_keys=True, ensure_ascii=False, default=str),
+    )
@@ -0,0 +1,136 @@
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.config_manager import ConfigManager
+from src.handlers.context_filler import fill_context
+from src.handlers.csv_loader import load_csv
+from src.handlers.event_aggregator import aggregate_events
+from src.handlers.event_differ import diff_events
+from src.pipeline import build_diff_portal, build_portal
+from src.utils.log import setup_logger
+
+
+BASE_CSV = (
+    "case_id,table,operation,trigger,attr_type,before,after\n"
+    "CASE-1,orders,UPDATE,t1,status,NEW,PAID\n"
+    "CASE-1,orders,,,amount,100,100\n"
+    "CASE-2,items,INSERT,t2,qty,NULL,3\n"
+    "CASE-3,users,DELETE,t3,name,bob,NULL\n"
+)
+TARGET_CSV = (
+    "case_id,table,operation,trigger,attr_type,before,after\n"
+    "CASE-1,orders,UPDATE,t1,status,NEW,SHIPPED\n"
+    "CASE-1,orders,,,amount,100,100\n"
+    "CASE-2,items,INSERT,t2,qty,NULL,3\n"
+    "CASE-4,users,INSERT,t4,name,NULL,alice\n"
+)
+
+
+def aggregate_text(directory, name, text, null_values, registry=None):
+    config = ConfigManager(os.path.join(ROOT_DIR, "config", "main.yaml")).load()
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+    rows = fill_context(
+        load_csv(path, config["csv"]["required_columns"]),
+        config["csv"]["carry_forward_columns"],
+        config["csv"]["required_columns"],
+    )
+    return aggregate_events(rows, null_values, registry)
+
+
+class TestDiffEvents(unittest.TestCase):
+    def diff(self, base_text, target_text):
+        with tempfile.TemporaryDirectory() as tmp:
+            base = aggregate_text(tmp, "base.csv", base_text, ["NULL", ""])
+            target = aggregate_text(tmp, "target.csv", target_text, ["NULL", ""], base.registry)
+        return base, diff_events(base, target)
+
+    def test_only_differing_attributes_are_kept(self):
+        base, diff = self.diff(BASE_CSV, TARGET_CSV)
+        registry = base.registry
+        by_key = {(event.case_id, event.table): event for event in diff}
+
+        self.assertEqual(
+            list(by_key), [("CASE-1", "orders"), ("CASE-3", "users"), ("CASE-4", "users")]
+        )
+        changed = by_key[("CASE-1", "orders")].changes
+        self.assertEqual(list(changed), [registry.lookup("orders::status")])
+        change = changed[registry.lookup("orders::status")]
+        self.assertEqual((change.before, change.after), ("PAID", "SHIPPED"))
+
+        removed = by_key[("CASE-3", "users")].changes[registry.lookup("users::name")]
+        self.assertEqual((removed.before, removed.after), ("NULL", ""))
+        added = by_key[("CASE-4", "users")].changes[registry.lookup("users::name")]
+        self.assertEqual((added.before, added.after), ("", "alice"))
+        self.assertEqual(diff.column_counts[registry.lookup("users::name")], 2)
+
+    def test_identical_inputs_produce_empty_diff(self):
+        _, diff = self.diff(BASE_CSV, BASE_CSV)
+        self.assertEqual(len(diff), 0)
+
+    def test_registries_must_be_shared(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            base = aggregate_text(tmp, "base.csv", BASE_CSV, ["NULL"])
+            target = aggregate_text(tmp, "target.csv", BASE_CSV, ["NULL"])
+        with self.assertRaises(ValueError):
+            diff_events(base, target)
+
+
+class TestDiffPortal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def prepare(self, base_text, target_text):
+        tmp = self.tmp.name
+        config = ConfigManager(os.path.join(ROOT_DIR, "config", "main.yaml")).load()
+        base_csv = os.path.join(tmp, "base.csv")
+        compare_csv = os.path.join(tmp, "target.csv")
+        for path, text in ((base_csv, base_text), (compare_csv, target_text)):
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+        output_dir = os.path.join(tmp, "portal")
+        config["paths"]["input_csv"] = base_csv
+        config["paths"]["output_dir"] = output_dir
+        config["paths"]["assets_dir"] = os.path.join(output_dir, "assets")
+        config["paths"]["log_dir"] = os.path.join(tmp, "logs")
+        return config, compare_csv, setup_logger(config["paths"]["log_dir"])
+
+    def test_normal_build_after_diff_is_not_skipped(self):
+        config, compare_csv, logger = self.prepare(BASE_CSV, TARGET_CSV)
+        self.assertNotIn("差分", read_text(build_portal(config, logger)))
+        self.assertIn("差分", read_text(build_diff_portal(config, compare_csv, logger)))
+        self.assertNotIn("差分", read_text(build_portal(config, logger)))
+
+    def test_before_only_difference_is_highlighted(self):
+        config, compare_csv, logger = self.prepare(
+            "case_id,table,operation,trigger,attr_type,before,after\n"
+            "CASE-1,orders,UPDATE,t1,status,A,X\n",
+            "case_id,table,operation,trigger,attr_type,before,after\n"
+            "CASE-1,orders,UPDATE,t1,status,B,X\n",
+        )
+        html = read_text(build_diff_portal(config, compare_csv, logger))
+        self.assertIn("<span class='change before-changed detail-hover'", html)
+        self.assertIn("title='base: A -&gt; X / target: B -&gt; X'>X</span>", html)
+        self.assertNotIn("class='change same", html)
+
+        config["display"]["render_mode"] = "virtual"
+        build_diff_portal(config, compare_csv, logger)
+        data = read_text(os.path.join(config["paths"]["output_dir"], "assets", "events.js"))
+        self.assertIn('"before-changed","base: A -&gt; X / target: B -&gt; X","X"', data)
+
+
+def read_text(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+if __name__ == "__main__":
+    unittest.main()
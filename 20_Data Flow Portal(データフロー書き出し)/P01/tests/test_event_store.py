@@ -0,0 +1,113 @@
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.config_manager import ConfigManager
+from src.handlers.context_filler import fill_context
+from src.handlers.csv_loader import load_csv
+from src.handlers.event_aggregator import aggregate_events
+from src.handlers.event_store import open_event_store, query_changes, write_event_store
+from src.pipeline import build_portal
+from src.utils.build_cache import BuildCache
+from src.utils.errors import UserInputError
+from src.utils.log import setup_logger
+
+
+def load_config():
+    return ConfigManager(os.path.join(ROOT_DIR, "config", "main.yaml")).load()
+
+
+def load_events(config):
+    csv_conf = config["csv"]
+    rows = fill_context(
+        load_csv(config["paths"]["input_csv"], csv_conf["required_columns"]),
+        csv_conf["carry_forward_columns"],
+        csv_conf["required_columns"],
+    )
+    return aggregate_events(rows, csv_conf["null_values"])
+
+
+class TestEventStore(unittest.TestCase):
+    def setUp(self):
+        self.config = load_config()
+        self.config["paths"]["input_csv"] = os.path.join(
+            ROOT_DIR, "data", "input", "data_flow_dummy.csv"
+        )
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "events.sqlite")
+
+    def open_store(self):
+        conn = open_event_store(self.path)
+        self.addCleanup(conn.close)
+        return conn
+
+    def test_changes_round_trip(self):
+        events = load_events(self.config)
+        write_event_store(self.path, events, self.config["paths"]["input_csv"])
+        conn = self.open_store()
+
+        expected = [
+            (event.case_id, event.table, events.registry.key(attr_id), change.before, change.after)
+            for event in events
+            for attr_id, change in event.changes.items()
+        ]
+        actual = [
+            (row["case_id"], row["table_name"], row["attr_key"], row["before"], row["after"])
+            for row in query_changes(conn)
+        ]
+        self.assertEqual(sorted(actual, key=repr), sorted(expected, key=repr))
+
+        attr_key = expected[0][2]
+        rows = list(query_changes(conn, attr_key=attr_key))
+        self.assertEqual(len(rows), sum(1 for item in expected if item[2] == attr_key))
+        self.assertTrue(all(row["attr_key"] == attr_key for row in rows))
+
+        case_id = expected[0][0]
+        rows = list(query_changes(conn, case_id=case_id, limit=1))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["case_id"], case_id)
+
+    def test_query_uses_indexes(self):
+        write_event_store(self.path, load_events(self.config), "input.csv")
+        conn = self.open_store()
+        plan = " ".join(
+            row[-1]
+            for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM changes c JOIN attrs a ON a.attr_id = c.attr_id "
+                "WHERE a.attr_key = ?",
+                ("orders::status",),
+            )
+        )
+        self.assertIn("idx_attrs_key", plan)
+        self.assertIn("idx_changes_attr", plan)
+
+    def test_missing_store_is_input_error(self):
+        with self.assertRaises(UserInputError):
+            open_event_store(self.path)
+
+    def test_build_portal_writes_store(self):
+        self.config["paths"]["output_dir"] = self.tmp.name
+        self.config["paths"]["assets_dir"] = os.path.join(self.tmp.name, "assets")
+        self.config["paths"]["log_dir"] = os.path.join(self.tmp.name, "logs")
+        self.config["store"]["enabled"] = True
+        logger = setup_logger(self.config["paths"]["log_dir"])
+
+        build_portal(self.config, logger)
+        self.assertTrue(os.path.exists(self.path))
+        cache = BuildCache(self.tmp.name)
+        self.assertIn("events.sqlite", cache.outputs)
+        self.assertNotIn("events.sqlite", cache.pages)
+
+        os.remove(self.path)
+        build_portal(self.config, logger)
+        self.assertTrue(os.path.exists(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,10 @@
 import os
+import random
 import re
 import sys
 import tempfile
 import unittest
+from types import SimpleNamespace
 
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if ROOT_DIR not in sys.path:
@@ -13,7 +15,12 @@ from src.handlers.column_planner import plan_columns
 from src.handlers.context_filler import fill_context
 from src.handlers.csv_loader import load_csv
 from src.handlers.event_aggregator import aggregate_events
-from src.handlers.portal_renderer import PortalRenderer
+from src.handlers.portal_renderer import (
+    PortalRenderer,
+    build_table_groups,
+    extract_table_names,
+    split_attr_key,
+)
 
 
 class TestTableGrouping(unittest.TestCase):
@@ -60,5 +67,63 @@ class TestTableGrouping(unittest.TestCase):
         self.assertEqual(len(labels), len(set(labels)), "table group labels are repeated")
 
 
+    def test_grouping_matches_prefix_scan(self):
+        random.seed(11)
+        tables = ["orders", "order_items", "payments", "s", "ship", "customers", "customer_tags"]
+        pieces = ["orders", "order", "items", "payment", "s", "ship", "customer", "tags", "x", ""]
+
+        for _ in range(200):
+            events = [
+                SimpleNamespace(table=random.choice(tables + ["", " orders "]))
+                for _ in range(random.randint(0, 8))
+            ]
+            columns = []
+            for _ in range(random.randint(0, 30)):
+                name = "_".join(random.choice(pieces) for _ in range(random.randint(1, 3)))
+                if random.random() < 0.4:
+                    name = f"{random.choice(tables + ['', 'unknown'])}::{name}"
+                if name not in columns:
+                    columns.append(name)
+
+            self.assertEqual(
+                build_table_groups(events, columns),
+                reference_table_groups(events, columns),
+            )
+
+
+def reference_table_groups(events, columns):
+    table_names = extract_table_names(events)
+
+    def resolve(column):
+        table, _ = split_attr_key(column)
+        if table:
+            return table
+        for name in table_names:
+            prefixes = [f"{name}_"]
+            if name.endswith("s") and len(name) > 1:
+                prefixes.append(f"{name[:-1]}_")
+            for prefix in prefixes:
+                if column.startswith(prefix):
+                    return name
+        return ""
+
+    grouped = []
+    used = set()
+    for table in table_names:
+        cols = [col for col in columns if resolve(col) == table]
+        if cols:
+            grouped.append((table, cols))
+            used.update(cols)
+
+    leftover = [col for col in columns if col not in used]
+    if leftover:
+        label = table_names[-1] if table_names else ""
+        if grouped and grouped[-1][0] == label:
+            grouped[-1] = (label, grouped[-1][1] + leftover)
+        else:
+            grouped.append((label, leftover))
+    return grouped
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,50 @@
+import os
+import sys
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.utils.nulls import NullMatcher, build_null_matcher
+
+
+NULL_VALUES = ["NULL", "null", "None", ""]
+SAMPLES = ["NULL", "null", " none ", "", "   ", None, "0", "PAID", "2026-02-01", "nullable"]
+
+
+def legacy_is_null(value, null_values):
+    if value is None:
+        return True
+    text = str(value).strip()
+    if text == "":
+        return True
+    return text.lower() in {str(v).lower() for v in null_values}
+
+
+class TestNullMatcher(unittest.TestCase):
+    def test_matches_legacy_semantics(self):
+        is_null = NullMatcher(NULL_VALUES)
+        for value in SAMPLES:
+            self.assertEqual(is_null(value), legacy_is_null(value, NULL_VALUES), value)
+            self.assertEqual(is_null.match(value), is_null(value), value)
+
+    def test_untrimmed_config_values_keep_legacy_semantics(self):
+        null_values = [" NULL ", "N/A"]
+        is_null = NullMatcher(null_values)
+        for value in [" NULL ", "NULL", "n/a", " N/A", "x"]:
+            self.assertEqual(is_null(value), legacy_is_null(value, null_values), value)
+
+    def test_build_reuses_compiled_matcher(self):
+        is_null = build_null_matcher(NULL_VALUES)
+        self.assertIs(build_null_matcher(is_null), is_null)
+
+    def test_non_string_values_are_stringified(self):
+        is_null = NullMatcher(["NULL", "0"]).match
+        self.assertTrue(is_null(0))
+        self.assertFalse(is_null(1))
+        self.assertFalse(is_null(False))
+
+
+if __name__ == "__main__":
+    unittest.main()
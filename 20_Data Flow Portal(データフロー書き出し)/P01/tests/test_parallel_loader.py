@@ -0,0 +1,161 @@
+import csv
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.config_manager import ConfigManager
+from src.handlers.context_filler import fill_context
+from src.handlers.csv_loader import load_csv
+from src.handlers.event_aggregator import aggregate_events
+from src.handlers.parallel_loader import ChunkOverlapError, parallel_ingest, plan_chunks, read_header
+from src.pipeline import ingest_events
+from src.utils.errors import UserInputError
+
+
+def load_config():
+    return ConfigManager(os.path.join(ROOT_DIR, "config", "main.yaml")).load()
+
+
+def load_csv_conf():
+    return load_config()["csv"]
+
+
+def serial_ingest(path, csv_conf):
+    rows = fill_context(
+        load_csv(path, csv_conf["required_columns"]),
+        csv_conf["carry_forward_columns"],
+        csv_conf["required_columns"],
+    )
+    return aggregate_events(rows, csv_conf["null_values"])
+
+
+def capture_error(func, *args):
+    try:
+        func(*args)
+    except UserInputError as exc:
+        return exc.message, exc.line_no
+    return None
+
+
+class TestParallelIngest(unittest.TestCase):
+    def setUp(self):
+        self.csv_conf = load_csv_conf()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, text):
+        path = os.path.join(self.tmp.name, "input.csv")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        return path
+
+    def assert_same_events(self, actual, expected):
+        self.assertEqual(list(actual), list(expected))
+        self.assertEqual(actual.registry.keys, expected.registry.keys)
+        self.assertEqual(actual.column_counts, expected.column_counts)
+        self.assertEqual(actual.lineage, expected.lineage)
+        for event, other in zip(actual, expected):
+            self.assertEqual(event.current_values.to_dict(), other.current_values.to_dict())
+
+    def test_chunks_match_serial_ingest(self):
+        path = os.path.join(ROOT_DIR, "data", "input", "data_flow_dummy.csv")
+        expected = serial_ingest(path, self.csv_conf)
+        for chunk_bytes in (512, 2048, 1 << 20):
+            events = parallel_ingest(path, self.csv_conf, 2, chunk_bytes)
+            self.assert_same_events(events, expected)
+
+    def test_chunks_split_only_between_cases(self):
+        path = self.write(
+            "case_id,table,attr_type,before,after,operation,trigger,sql\n"
+            'A,orders,status,,"multi\nline, quoted",INSERT,t1,"SELECT ""x"""\n'
+            "A,orders,amount,1,2,UPDATE,t1,\n"
+            "B,orders,status,,open,INSERT,t2,\n"
+            "B,,amount,,5,,,\n"
+            "C,orders,status,open,closed,UPDATE,t3,\n"
+        )
+        fieldnames, header_end = read_header(path)
+        chunks = plan_chunks(path, header_end, fieldnames, 16)
+        self.assertGreater(len(chunks), 1)
+        with open(path, "rb") as f:
+            data = f.read()
+        for start, _ in chunks[1:]:
+            self.assertIn(data[start:start + 2], (b"B,", b"C,"))
+        self.assert_same_events(
+            parallel_ingest(path, self.csv_conf, 2, 16), serial_ingest(path, self.csv_conf)
+        )
+
+    def test_error_line_numbers_match_serial(self):
+        path = self.write(
+            "case_id,table,attr_type,before,after,operation,trigger,sql\n"
+            "A,orders,status,,new,INSERT,t1,\n"
+            "B,orders,status,,new,INSERT,t1,\n"
+            "C,orders,status,,new,INSERT,t1,\n"
+            ",orders,amount,,1,UPDATE,t1,\n"
+        )
+        expected = capture_error(serial_ingest, path, self.csv_conf)
+        self.assertIsNotNone(expected)
+        self.assertEqual(capture_error(parallel_ingest, path, self.csv_conf, 2, 16), expected)
+
+    def test_revisited_case_across_chunks_is_rejected(self):
+        path = self.write(
+            "case_id,table,attr_type,before,after,operation,trigger,sql\n"
+            "A,orders,status,,new,INSERT,t1,\n"
+            "B,orders,status,,new,INSERT,t1,\n"
+            "A,orders,status,new,done,UPDATE,t1,\n"
+        )
+        with self.assertRaises(ChunkOverlapError):
+            parallel_ingest(path, self.csv_conf, 2, 16)
+
+
+class TestParallelFallback(unittest.TestCase):
+    def setUp(self):
+        self.config = load_config()
+        self.config["csv"]["parallel_workers"] = 2
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch(
+            "src.handlers.parallel_loader.parallel_ingest", side_effect=AssertionError
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_row_cache_input_stays_serial(self):
+        path = os.path.join(ROOT_DIR, "data", "input", "data_flow_dummy.csv")
+        self.config["paths"]["input_csv"] = path
+        self.config["csv"]["row_cache"] = True
+        self.config["csv"]["row_cache_dir"] = self.tmp.name
+        events = ingest_events(self.config, self.config["csv"]["null_values"])
+        self.assertEqual(list(events), list(serial_ingest(path, self.config["csv"])))
+        self.assertEqual(len(os.listdir(self.tmp.name)), 1)
+
+    def test_parquet_input_stays_serial(self):
+        path = os.path.join(self.tmp.name, "input.parquet")
+        self.config["paths"]["input_csv"] = path
+        try:
+            import pyarrow
+            import pyarrow.parquet as pq
+        except ImportError:
+            with open(path, "wb") as f:
+                f.write(b"PAR1")
+            # CSV として分割されず、Parquet の読込（pyarrow 未導入の入力エラー）まで進む
+            with self.assertRaisesRegex(UserInputError, "pyarrow"):
+                ingest_events(self.config, self.config["csv"]["null_values"])
+            return
+        csv_path = os.path.join(ROOT_DIR, "data", "input", "data_flow_dummy.csv")
+        with open(csv_path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            fieldnames = next(reader)
+            columns = list(zip(*reader))
+        pq.write_table(pyarrow.table(dict(zip(fieldnames, map(list, columns)))), path)
+        events = ingest_events(self.config, self.config["csv"]["null_values"])
+        self.assertEqual(len(events), len(serial_ingest(csv_path, self.config["csv"])))
+
+
+if __name__ == "__main__":
+    unittest.main()
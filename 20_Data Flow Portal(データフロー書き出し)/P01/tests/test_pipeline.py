@@ -0,0 +1,338 @@
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.config_manager import ConfigManager
+from src.handlers.column_planner import plan_columns, plan_event_columns
+from src.handlers.context_filler import fill_columns, fill_context, iter_fill_context
+from src.handlers.csv_loader import iter_csv, load_columns, load_csv, row_cache_path
+from src.handlers.event_aggregator import aggregate_events, build_lineage
+from src.pipeline import ingest_events
+from src.utils.errors import UserInputError
+from src.utils.nulls import build_null_matcher
+
+
+def load_config():
+    return ConfigManager(os.path.join(ROOT_DIR, "config", "main.yaml")).load()
+
+
+def write_csv(directory, text, name="input.csv"):
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+    return path
+
+
+class TestStreamingPipeline(unittest.TestCase):
+    def test_streaming_matches_list_pipeline(self):
+        config = load_config()
+        csv_conf = config["csv"]
+        path = os.path.join(ROOT_DIR, "data", "input", "data_flow_dummy.csv")
+
+        filled = fill_context(
+            load_csv(path, csv_conf["required_columns"]),
+            csv_conf["carry_forward_columns"],
+            csv_conf["required_columns"],
+        )
+        expected = aggregate_events(filled, csv_conf["null_values"])
+
+        streamed_rows = iter_fill_context(
+            iter_csv(path, csv_conf["required_columns"]),
+            csv_conf["carry_forward_columns"],
+            csv_conf["required_columns"],
+        )
+        self.assertFalse(isinstance(streamed_rows, list))
+        events = aggregate_events(streamed_rows, csv_conf["null_values"])
+
+        self.assertEqual(events, expected)
+        self.assertEqual(
+            plan_columns(filled, []),
+            plan_columns(
+                iter_fill_context(
+                    iter_csv(path, csv_conf["required_columns"]),
+                    csv_conf["carry_forward_columns"],
+                    csv_conf["required_columns"],
+                ),
+                [],
+            ),
+        )
+
+    def test_streaming_reports_line_number(self):
+        config = load_config()
+        csv_conf = config["csv"]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_csv(
+                tmp,
+                "case_id,table,attr_type,before,after\n"
+                "CASE-1,orders,status,NULL,NEW\n"
+                "CASE-1,,,NEW,PAID\n",
+            )
+            rows = iter_fill_context(
+                iter_csv(path, csv_conf["required_columns"]),
+                csv_conf["carry_forward_columns"],
+                csv_conf["required_columns"],
+            )
+            with self.assertRaises(UserInputError) as ctx:
+                aggregate_events(rows, csv_conf["null_values"])
+            self.assertEqual(ctx.exception.line_no, 3)
+
+
+class TestFusedColumnPlan(unittest.TestCase):
+    def test_event_column_plan_matches_row_plan(self):
+        config = load_config()
+        csv_conf = config["csv"]
+        for name in ("data_flow_dummy.csv", "data_flow_dummy_alt.csv"):
+            path = os.path.join(ROOT_DIR, "data", "input", name)
+            filled = fill_context(
+                load_csv(path, csv_conf["required_columns"]),
+                csv_conf["carry_forward_columns"],
+                csv_conf["required_columns"],
+            )
+            events = aggregate_events(filled, csv_conf["null_values"])
+            for priority in ([], ["orders::order_amount", "missing::attr"]):
+                self.assertEqual(
+                    plan_event_columns(events, priority),
+                    plan_columns(filled, priority),
+                    name,
+                )
+
+
+class TestCurrentValueSnapshots(unittest.TestCase):
+    def test_revisited_event_does_not_leak_into_later_event(self):
+        rows = [
+            {"case_id": "A", "table": "orders", "attr_type": "status", "after": "NEW"},
+            {"case_id": "B", "table": "orders", "attr_type": "amount", "after": "10"},
+            {"case_id": "A", "table": "orders", "attr_type": "status", "after": "PAID"},
+            {"case_id": "C", "table": "orders", "attr_type": "memo", "after": "NULL"},
+        ]
+        events = aggregate_events(rows, ["NULL"])
+        named = events.registry.named
+        a, b, c = events
+
+        self.assertEqual(named(a.current_values), {"orders::status": "PAID"})
+        self.assertEqual(
+            named(b.current_values),
+            {"orders::status": "NEW", "orders::amount": "10"},
+        )
+        self.assertEqual(
+            named(c.current_values),
+            {"orders::status": "PAID", "orders::memo": None},
+        )
+
+    def test_long_chains_are_flattened(self):
+        rows = [
+            {"case_id": f"C{idx}", "table": "orders", "attr_type": f"a{idx}", "after": str(idx)}
+            for idx in range(100)
+        ]
+        events = aggregate_events(rows, [])
+        last = events[-1].current_values
+        self.assertEqual(len(last), 100)
+        self.assertEqual(last[events.registry.lookup("orders::a0")], "0")
+        self.assertLessEqual(last._depth, last.max_depth)
+
+
+class TestLineageIndex(unittest.TestCase):
+    def test_lineage_lists_event_positions_per_attr(self):
+        rows = [
+            {"case_id": "A", "table": "orders", "attr_type": "status", "after": "NEW"},
+            {"case_id": "B", "table": "orders", "attr_type": "amount", "after": "10"},
+            {"case_id": "B", "table": "orders", "attr_type": "amount", "after": "20"},
+            {"case_id": "C", "table": "orders", "attr_type": "status", "after": "PAID"},
+            {"case_id": "A", "table": "orders", "attr_type": "amount", "after": "5"},
+        ]
+        events = aggregate_events(rows, [])
+        lookup = events.registry.lookup
+
+        self.assertEqual(events.lineage[lookup("orders::status")], [0, 2])
+        self.assertEqual(events.lineage[lookup("orders::amount")], [0, 1])
+        self.assertEqual(events.lineage, build_lineage(events))
+
+    def test_lineage_matches_rebuilt_index(self):
+        config = load_config()
+        csv_conf = config["csv"]
+        path = os.path.join(ROOT_DIR, "data", "input", "data_flow_dummy.csv")
+        filled = fill_context(
+            load_csv(path, csv_conf["required_columns"]),
+            csv_conf["carry_forward_columns"],
+            csv_conf["required_columns"],
+        )
+        events = aggregate_events(filled, csv_conf["null_values"])
+        self.assertEqual(events.lineage, build_lineage(events))
+        self.assertEqual(
+            sum(len(positions) for positions in events.lineage.values()),
+            sum(len(event.changes) for event in events),
+        )
+
+
+class TestRowCache(unittest.TestCase):
+    def test_cached_rows_match_csv_rows(self):
+        config = load_config()
+        required = config["csv"]["required_columns"]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_csv(
+                tmp,
+                "case_id,table,attr_type,before,after\n"
+                "CASE-1,orders,status,NULL,NEW\n"
+                "CASE-1,,\"multi\nline\",NEW,PAID\n"
+                "CASE-2,items,qty,,3\n",
+            )
+            cache_dir = os.path.join(tmp, "cache")
+            expected = load_csv(path, required)
+            first = load_csv(path, required, cache_dir)
+            cache_path = row_cache_path(path, cache_dir)
+            self.assertTrue(os.path.exists(cache_path))
+
+            stat = os.stat(path)
+            with open(path, "r+", encoding="utf-8") as f:
+                f.write("x")
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            cached = load_csv(path, required, cache_dir)
+
+            with self.assertRaises(UserInputError):
+                load_csv(path, required + ["missing"], cache_dir)
+
+        self.assertEqual(first, expected)
+        self.assertEqual(cached, expected)
+        self.assertEqual([row["_line_no"] for row in cached], [2, 3, 4])
+
+    def test_changed_csv_replaces_cache(self):
+        config = load_config()
+        required = config["csv"]["required_columns"]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_csv(tmp, "case_id,attr_type\nA,x\n")
+            cache_dir = os.path.join(tmp, "cache")
+            load_csv(path, required, cache_dir)
+            write_csv(tmp, "case_id,attr_type\nA,x\nB,y\n")
+            rows = load_csv(path, required, cache_dir)
+            rows = load_csv(path, required, cache_dir)
+            cache_files = os.listdir(cache_dir)
+
+        self.assertEqual([row["case_id"] for row in rows], ["A", "B"])
+        self.assertEqual(len(cache_files), 1)
+
+    def test_parquet_input_requires_pyarrow(self):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            pass
+        else:
+            self.skipTest("pyarrow is installed")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_csv(tmp, "", name="input.parquet")
+            with self.assertRaises(UserInputError):
+                load_csv(path, ["case_id", "attr_type"])
+
+
+class TestPandasFillEngine(unittest.TestCase):
+    def setUp(self):
+        try:
+            import pandas  # noqa: F401
+        except ImportError:
+            self.skipTest("pandas is not installed")
+
+    def fill_both(self, text, required=("case_id", "attr_type")):
+        carry = load_config()["csv"]["carry_forward_columns"]
+        required = list(required)
+        results = []
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_csv(tmp, text)
+            for fill in (fill_rows, fill_column_rows):
+                try:
+                    results.append((fill(path, carry, required), None))
+                except UserInputError as exc:
+                    results.append((None, (str(exc), exc.line_no)))
+        return results
+
+    def assert_engines_match(self, config):
+        null_matcher = build_null_matcher(config["csv"]["null_values"])
+        # pandas を先に流し、列のまま書いた行キャッシュを python 側でも読めることを確かめる
+        config["csv"]["fill_engine"] = "pandas"
+        actual = ingest_events(config, null_matcher)
+        config["csv"]["fill_engine"] = "python"
+        expected = ingest_events(config, null_matcher)
+        self.assertEqual(actual, expected)
+        self.assertEqual(actual.registry.keys, expected.registry.keys)
+        self.assertEqual(actual.column_counts, expected.column_counts)
+        self.assertEqual(actual.lineage, expected.lineage)
+
+    def test_matches_python_engine(self):
+        config = load_config()
+        config["paths"]["input_csv"] = os.path.join(ROOT_DIR, "data", "input", "data_flow_dummy.csv")
+        with tempfile.TemporaryDirectory() as tmp:
+            config["csv"]["row_cache"] = True
+            config["csv"]["row_cache_dir"] = tmp
+            for _ in range(2):
+                # 1回目は CSV を列で読んで行キャッシュを書き、2回目は両エンジンともキャッシュから読む
+                self.assert_engines_match(config)
+            self.assertEqual(len(os.listdir(tmp)), 1)
+
+    def test_ragged_rows_match_python_engine(self):
+        (expected, _), (actual, _) = self.fill_both(
+            "case_id,table,attr_type,after\n"
+            "A,orders,x\n"
+            "\n"
+            "A,,y,2\n"
+        )
+        self.assertEqual(actual, expected)
+        self.assertEqual([row["_line_no"] for row in actual], [2, 3])
+
+        config = load_config()
+        with tempfile.TemporaryDirectory() as tmp:
+            config["csv"]["row_cache"] = True
+            config["csv"]["row_cache_dir"] = tmp
+            config["paths"]["input_csv"] = write_csv(
+                tmp,
+                "case_id,table,attr_type,after\n"
+                "A,orders,x,1,extra\n"
+                "A,,y,2\n",
+            )
+            self.assertIsNone(load_columns(config["paths"]["input_csv"], ["case_id", "attr_type"]))
+            self.assert_engines_match(config)
+
+    def test_context_resets_per_case_run(self):
+        (expected, _), (actual, _) = self.fill_both(
+            "case_id,table,attr_type\n"
+            "A,orders,x\n"
+            "A,,y\n"
+            "B,,z\n"
+            "A,,w\n"
+        )
+        self.assertEqual(actual, expected)
+        self.assertEqual([row["table"] for row in actual], ["orders", "orders", "", ""])
+
+    def test_errors_match_python_engine(self):
+        for text in (
+            "case_id,table,attr_type\nA,orders,x\n,orders,y\n",
+            "case_id,table,attr_type\nA,orders,x\nA,, \nA,,z\n",
+        ):
+            (_, expected_error), (_, actual_error) = self.fill_both(text)
+            self.assertIsNotNone(expected_error)
+            self.assertEqual(actual_error, expected_error)
+
+        (_, expected_error), (_, actual_error) = self.fill_both(
+            "case_id,table,attr_type\nA,,x\n", ("case_id", "attr_type", "table")
+        )
+        self.assertEqual(actual_error, expected_error)
+        self.assertIn("table", actual_error[0])
+
+
+def fill_rows(path, carry, required):
+    return fill_context(load_csv(path, required), carry, required)
+
+
+def fill_column_rows(path, carry, required):
+    fieldnames, columns = load_columns(path, required)
+    columns = fill_columns(fieldnames, columns, carry, required)
+    return [
+        dict(zip(fieldnames, values), _line_no=line_no)
+        for line_no, values in enumerate(zip(*columns), start=2)
+    ]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import json
+import logging
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.utils.profiler import PROFILE_NAME, StageProfiler
+
+
+class TestStageProfiler(unittest.TestCase):
+    def test_disabled_profiler_is_passthrough(self):
+        profiler = StageProfiler(False)
+        profiler.start()
+        rows = [1, 2, 3]
+        with profiler.stage("load") as stage:
+            self.assertIs(profiler.count(stage, "rows", rows), rows)
+        self.assertEqual(profiler.stages, [])
+        self.assertIsNone(profiler.report(logging.getLogger("test"), "unused"))
+
+    def test_report_appends_json_lines(self):
+        profiler = StageProfiler(True)
+        profiler.start()
+        with profiler.stage("load") as stage:
+            rows = list(profiler.count(stage, "rows", iter(range(5))))
+        with profiler.stage("aggregate") as stage:
+            stage["events"] = len(rows)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            logger = logging.getLogger("test_profiler")
+            path = profiler.report(logger, tmp, input_csv="input.csv")
+            profiler.report(logger, tmp)
+            self.assertEqual(path, os.path.join(tmp, PROFILE_NAME))
+            with open(path, "r", encoding="utf-8") as f:
+                lines = [json.loads(line) for line in f]
+
+        self.assertEqual(len(lines), 2)
+        first = lines[0]
+        self.assertEqual(first["input_csv"], "input.csv")
+        self.assertEqual([s["stage"] for s in first["stages"]], ["load", "aggregate"])
+        self.assertEqual(first["stages"][0]["rows"], 5)
+        self.assertEqual(first["stages"][1]["events"], 5)
+        for key in ("wall_sec", "cpu_sec", "peak_mem_mb"):
+            self.assertIn(key, first["stages"][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,383 @@
+import gzip
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.batch import plan_batch, render_batch
+from src.config_manager import ConfigManager
+from src.handlers.column_planner import plan_event_columns
+from src.handlers.context_filler import fill_context
+from src.handlers.csv_loader import load_csv
+from src.handlers.event_aggregator import aggregate_events
+from src.handlers.portal_renderer import RENDERER_VERSION, PortalRenderer, build_filter_index
+from src.pipeline import build_portal
+from src.utils.build_cache import BuildCache, build_key
+
+
+def build_inputs(name="data_flow_dummy_alt.csv"):
+    config = ConfigManager(os.path.join(ROOT_DIR, "config", "main.yaml")).load()
+    config["paths"]["input_csv"] = os.path.join(ROOT_DIR, "data", "input", name)
+    rows = load_csv(config["paths"]["input_csv"], config["csv"]["required_columns"])
+    filled = fill_context(
+        rows,
+        config["csv"]["carry_forward_columns"],
+        config["csv"]["required_columns"],
+    )
+    events = aggregate_events(filled, config["csv"]["null_values"])
+    columns = plan_event_columns(events, config["display"].get("priority_columns", []))
+    return config, events, columns
+
+
+def use_output_dir(config, output_dir):
+    config["paths"]["output_dir"] = output_dir
+    config["paths"]["assets_dir"] = os.path.join(output_dir, "assets")
+
+
+class TestStreamingHtml(unittest.TestCase):
+    def test_iter_html_yields_header_rows_and_footer(self):
+        config, events, columns = build_inputs()
+        config["display"]["show_generated_at"] = False
+        renderer = PortalRenderer(config)
+        chunks = list(
+            renderer.iter_html(events, columns, config["paths"]["input_csv"], "assets/style.css")
+        )
+
+        self.assertEqual(len(chunks), len(events) + 2)
+        self.assertTrue(chunks[0].startswith("<!DOCTYPE html>"))
+        self.assertTrue(chunks[-1].rstrip().endswith("</html>"))
+        self.assertEqual(
+            "".join(chunks),
+            renderer.build_html(events, columns, config["paths"]["input_csv"], "assets/style.css"),
+        )
+
+
+class TestFilterIndex(unittest.TestCase):
+    def test_index_maps_rows_and_column_ranges(self):
+        config, events, columns = build_inputs()
+        renderer = PortalRenderer(config)
+        _, grouped_columns, col_group_map, _ = renderer.build_header(events, columns)
+        fixed_count = len(config["display"]["fixed_columns"])
+        index = build_filter_index(events, grouped_columns, col_group_map, fixed_count)
+
+        for table, rows in index["tables"].items():
+            self.assertEqual(rows, [i for i, e in enumerate(events) if e.table == table])
+        for case_id, rows in index["cases"].items():
+            self.assertEqual(rows, [i for i, e in enumerate(events) if e.case_id == case_id])
+        for group, ranges in index["groups"].items():
+            for start, end in ranges:
+                self.assertTrue(
+                    all(col_group_map[col] == group for col in grouped_columns[start:end])
+                )
+        self.assertEqual(
+            sum(end - start for ranges in index["groups"].values() for start, end in ranges),
+            len(grouped_columns),
+        )
+        self.assertEqual(index["fixed"], fixed_count)
+
+        html = renderer.build_html(events, columns, config["paths"]["input_csv"], "assets/style.css")
+        self.assertIn("window.PORTAL_INDEX = ", html)
+        self.assertIn('id="caseSearch"', html)
+        self.assertNotIn("querySelectorAll('tbody tr')", html)
+
+
+class TestVirtualRendering(unittest.TestCase):
+    def test_virtual_mode_writes_data_file_and_empty_body(self):
+        config, events, columns = build_inputs()
+        config["display"]["render_mode"] = "virtual"
+        with tempfile.TemporaryDirectory() as tmp:
+            use_output_dir(config, tmp)
+            index_path = PortalRenderer(config).render(
+                events, columns, config["paths"]["input_csv"]
+            )
+            with open(index_path, encoding="utf-8") as f:
+                html = f.read()
+            with open(os.path.join(tmp, "assets", "events.js"), encoding="utf-8") as f:
+                script = f.read()
+
+        self.assertIn('<tbody id="virtualBody">', html)
+        self.assertIn('src="assets/events.js"', html)
+        self.assertNotIn("<tr class='op-", html)
+
+        prefix = "window.PORTAL_DATA = "
+        self.assertTrue(script.startswith(prefix))
+        data = json.loads(script[len(prefix):].rstrip().rstrip(";"))
+        self.assertEqual(len(data["rows"]), len(events))
+        self.assertEqual(len(data["groups"]), len(columns))
+        self.assertEqual(len(data["fixedClasses"]), len(config["display"]["fixed_columns"]))
+        self.assertEqual(
+            sorted(idx for rows in data["index"]["cases"].values() for idx in rows),
+            list(range(len(events))),
+        )
+
+
+class TestShardedRendering(unittest.TestCase):
+    def test_table_shards_have_one_page_per_table(self):
+        config, events, columns = build_inputs()
+        config["display"]["shard_by"] = "table"
+        tables = []
+        for event in events:
+            if event.table not in tables:
+                tables.append(event.table)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            use_output_dir(config, tmp)
+            index_path = PortalRenderer(config).render(
+                events, columns, config["paths"]["input_csv"]
+            )
+            pages = sorted(os.listdir(os.path.join(tmp, "shards")))
+            with open(index_path, encoding="utf-8") as f:
+                index_html = f.read()
+            with open(os.path.join(tmp, "shards", pages[0]), encoding="utf-8") as f:
+                shard_html = f.read()
+
+        self.assertEqual(len(pages), len(tables))
+        for page in pages:
+            self.assertIn(f"href='shards/{page}'", index_html)
+        self.assertIn("id='shardNav'", shard_html)
+        self.assertIn('href="../assets/style.css"', shard_html)
+        self.assertEqual(set(re.findall(r"data-table='([^']*)'", shard_html)), {tables[0]})
+
+    def test_case_shards_split_by_case_count(self):
+        config, events, columns = build_inputs()
+        config["display"]["shard_by"] = "case"
+        config["display"]["shard_size"] = 3
+        cases = {event.case_id for event in events}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            use_output_dir(config, tmp)
+            PortalRenderer(config).render(events, columns, config["paths"]["input_csv"])
+            pages = sorted(os.listdir(os.path.join(tmp, "shards")))
+
+        self.assertEqual(len(pages), (len(cases) + 2) // 3)
+
+
+class TestLineagePage(unittest.TestCase):
+    def test_lineage_page_lists_each_attr_timeline(self):
+        config, events, columns = build_inputs()
+        config["display"]["lineage_page"] = True
+
+        with tempfile.TemporaryDirectory() as tmp:
+            use_output_dir(config, tmp)
+            renderer = PortalRenderer(config)
+            index_path = renderer.render(events, columns, config["paths"]["input_csv"])
+            with open(index_path, encoding="utf-8") as f:
+                index_html = f.read()
+            with open(os.path.join(tmp, "lineage.html"), encoding="utf-8") as f:
+                lineage_html = f.read()
+
+        self.assertIn("href='lineage.html'", index_html)
+        self.assertNotIn("lineage.html", renderer.page_hashes)
+        self.assertIn(os.path.join(tmp, "lineage.html"), renderer.outputs)
+        for attr_id, positions in events.lineage.items():
+            section = lineage_html.split(f"id='attr-{attr_id}'", 1)[1].split("</section>", 1)[0]
+            self.assertEqual(section.count("<tr"), len(positions) + 1)
+            cases = re.findall(r"<tr[^>]*><td>\d+</td><td>([^<]*)</td>", section)
+            self.assertEqual(cases, [events[position].case_id for position in positions])
+
+    def test_lineage_page_is_opt_in(self):
+        config, events, columns = build_inputs()
+        with tempfile.TemporaryDirectory() as tmp:
+            use_output_dir(config, tmp)
+            index_path = PortalRenderer(config).render(
+                events, columns, config["paths"]["input_csv"]
+            )
+            with open(index_path, encoding="utf-8") as f:
+                index_html = f.read()
+            self.assertFalse(os.path.exists(os.path.join(tmp, "lineage.html")))
+        self.assertNotIn("lineage.html", index_html)
+
+
+class TestCompactOutput(unittest.TestCase):
+    def test_sticky_columns_use_page_classes(self):
+        config, events, columns = build_inputs()
+        html = PortalRenderer(config).build_html(
+            events, columns, config["paths"]["input_csv"], "assets/style.css"
+        )
+        body = html.split("<tbody", 1)[1]
+
+        self.assertNotIn("style=", body)
+        self.assertNotIn("data-group=", body)
+        for idx in range(len(config["display"]["fixed_columns"])):
+            self.assertIn(f".sticky-col.fix-{idx} {{ left:", html)
+            self.assertIn(f"<td class='sticky-col fix-{idx}'>", body)
+
+    def test_compressed_siblings_and_size_report(self):
+        config, events, columns = build_inputs()
+        config["output"] = {"compress": ["gzip"], "size_report": True}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            use_output_dir(config, tmp)
+            renderer = PortalRenderer(config)
+            index_path = renderer.render(events, columns, config["paths"]["input_csv"])
+            with open(index_path, "rb") as f:
+                raw = f.read()
+            with gzip.open(index_path + ".gz", "rb") as f:
+                self.assertEqual(f.read(), raw)
+            gz_mtime = os.stat(index_path + ".gz").st_mtime_ns
+            with open(os.path.join(tmp, "size_report.json"), encoding="utf-8") as f:
+                report = json.load(f)
+
+            renderer.finish_outputs()
+            self.assertEqual(os.stat(index_path + ".gz").st_mtime_ns, gz_mtime)
+
+        entries = {entry["path"]: entry for entry in report["files"]}
+        self.assertEqual(set(entries), {"index.html", "assets/style.css"})
+        self.assertEqual(entries["index.html"]["bytes"], len(raw))
+        self.assertLess(entries["index.html"]["gzip"], len(raw))
+        self.assertEqual(report, renderer.size_report)
+
+
+class TestIncrementalRendering(unittest.TestCase):
+    def test_unchanged_shards_are_not_rewritten(self):
+        config, events, columns = build_inputs()
+        config["display"]["shard_by"] = "table"
+
+        with tempfile.TemporaryDirectory() as tmp:
+            use_output_dir(config, tmp)
+            first = PortalRenderer(config)
+            first.render(events, columns, config["paths"]["input_csv"])
+            self.assertEqual(first.skipped_pages, [])
+
+            second = PortalRenderer(config)
+            second.previous_pages = dict(first.page_hashes)
+            changed_page = sorted(first.page_hashes)[0]
+            second.previous_pages[changed_page] = "outdated"
+            second.render(events, columns, config["paths"]["input_csv"])
+
+        self.assertEqual(second.page_hashes, first.page_hashes)
+        self.assertEqual(
+            sorted(second.skipped_pages),
+            sorted(page for page in first.page_hashes if page != changed_page),
+        )
+
+    def test_missing_virtual_data_forces_rebuild(self):
+        config, _, _ = build_inputs()
+        config["display"]["render_mode"] = "virtual"
+        logger = logging.getLogger("test_incremental")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            use_output_dir(config, tmp)
+            data_path = os.path.join(tmp, "assets", "events.js")
+            build_portal(config, logger)
+            self.assertIn("assets/events.js", BuildCache(tmp).outputs)
+
+            os.remove(data_path)
+            key = build_key(config["paths"]["input_csv"], config, RENDERER_VERSION)
+            self.assertFalse(BuildCache(tmp).is_fresh(key))
+            build_portal(config, logger)
+            self.assertTrue(os.path.exists(data_path))
+            self.assertTrue(BuildCache(tmp).is_fresh(key))
+
+    def test_missing_lineage_page_forces_rebuild(self):
+        config, _, _ = build_inputs()
+        config["display"]["lineage_page"] = True
+        logger = logging.getLogger("test_incremental")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            use_output_dir(config, tmp)
+            build_portal(config, logger)
+            cache = BuildCache(tmp)
+            self.assertIn("lineage.html", cache.outputs)
+            self.assertNotIn("lineage.html", cache.pages)
+
+            os.remove(os.path.join(tmp, "lineage.html"))
+            build_portal(config, logger)
+            self.assertTrue(os.path.exists(os.path.join(tmp, "lineage.html")))
+
+    def test_build_key_tracks_input_and_config(self):
+        config, _, _ = build_inputs()
+        with tempfile.TemporaryDirectory() as tmp:
+            input_csv = os.path.join(tmp, "input.csv")
+            with open(input_csv, "w", encoding="utf-8") as f:
+                f.write("case_id,attr_type\nA,x\n")
+            key = build_key(input_csv, config, RENDERER_VERSION)
+
+            cache = BuildCache(tmp)
+            self.assertFalse(cache.is_fresh(key))
+            with open(cache.index_path, "w", encoding="utf-8") as f:
+                f.write("<html></html>")
+            cache.save(key, {})
+            self.assertTrue(BuildCache(tmp).is_fresh(key))
+
+            config["display"]["show_legend"] = False
+            self.assertNotEqual(build_key(input_csv, config, RENDERER_VERSION), key)
+            with open(input_csv, "a", encoding="utf-8") as f:
+                f.write("B,y\n")
+            self.assertNotEqual(build_key(input_csv, config, RENDERER_VERSION), key)
+
+
+class TestBatchRendering(unittest.TestCase):
+    def test_plan_batch_deduplicates_names(self):
+        names = plan_batch(["a/input.csv", "b/input.csv", "c/other.csv"])
+        self.assertEqual(list(names.values()), ["input", "input_2", "other"])
+
+    def test_batch_renders_each_input_with_shared_css(self):
+        config, _, _ = build_inputs()
+        inputs = [
+            os.path.join(ROOT_DIR, "data", "input", "data_flow_dummy.csv"),
+            os.path.join(ROOT_DIR, "data", "input", "data_flow_dummy_alt.csv"),
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            config["paths"]["log_dir"] = os.path.join(tmp, "logs")
+            logger = logging.getLogger("test_batch")
+            index_path = render_batch(config, inputs, tmp, logger, workers=2)
+            with open(index_path, encoding="utf-8") as f:
+                index_html = f.read()
+            with open(os.path.join(tmp, "data_flow_dummy_alt", "index.html"), encoding="utf-8") as f:
+                page_html = f.read()
+            self.assertTrue(os.path.exists(os.path.join(tmp, "assets", "style.css")))
+            self.assertFalse(os.path.exists(os.path.join(tmp, "data_flow_dummy", "assets", "style.css")))
+
+        self.assertIn("href='data_flow_dummy/index.html'", index_html)
+        self.assertIn("href='data_flow_dummy_alt/index.html'", index_html)
+        self.assertIn('href="../assets/style.css"', page_html)
+        self.assertIn('data-navigate="1"', page_html)
+        self.assertIn("value='../data_flow_dummy/index.html'", page_html)
+        self.assertIn("value='../data_flow_dummy_alt/index.html' selected", page_html)
+
+    def test_normal_build_after_batch_is_not_skipped(self):
+        config, _, _ = build_inputs()
+        inputs = [config["paths"]["input_csv"]]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            use_output_dir(config, tmp)
+            config["paths"]["log_dir"] = os.path.join(tmp, "logs")
+            logger = logging.getLogger("test_batch")
+            index_path = build_portal(config, logger)
+            self.assertEqual(render_batch(config, inputs, tmp, logger, workers=1), index_path)
+            build_portal(config, logger)
+            with open(index_path, encoding="utf-8") as f:
+                self.assertNotIn("<th>入力CSV</th><th>パス</th>", f.read())
+
+    def test_non_positive_workers_is_input_error(self):
+        result = subprocess.run(
+            [
+                sys.executable,
+                os.path.join(ROOT_DIR, "src", "main.py"),
+                "--config",
+                os.path.join(ROOT_DIR, "config", "main.yaml"),
+                "--batch",
+                "--workers",
+                "0",
+            ],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+        )
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("[INPUT ERROR] --workers", result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,200 @@
+import gzip
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from urllib.error import HTTPError
+from urllib.parse import quote
+from urllib.request import Request, urlopen
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.config_manager import ConfigManager
+from src.server import EventCache, PortalService, start_portal_server, start_server
+from src.utils.compress import compress_file
+from src.utils.errors import UserInputError
+
+
+def load_config():
+    config = ConfigManager(os.path.join(ROOT_DIR, "config", "main.yaml")).load()
+    config["paths"]["input_csv"] = os.path.join(ROOT_DIR, "data", "input", "data_flow_dummy.csv")
+    config["display"]["input_candidates"] = [
+        config["paths"]["input_csv"],
+        os.path.join(ROOT_DIR, "data", "input", "data_flow_dummy_alt.csv"),
+    ]
+    return config
+
+
+class TestEventCache(unittest.TestCase):
+    def test_lru_eviction_and_reload_on_change(self):
+        loads = []
+
+        def load(path):
+            loads.append(path)
+            return object()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for name in ("a.csv", "b.csv", "c.csv"):
+                path = os.path.join(tmp, name)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write("case_id,attr_type\n")
+                paths.append(path)
+
+            cache = EventCache(load, capacity=2)
+            first = cache.get(paths[0])
+            cache.get(paths[1])
+            self.assertIs(cache.get(paths[0]), first)
+            cache.get(paths[2])
+            cache.get(paths[0])
+            cache.get(paths[1])
+            with open(paths[0], "a", encoding="utf-8") as f:
+                f.write("A,x\n")
+            self.assertIsNot(cache.get(paths[0]), first)
+
+        self.assertEqual(loads, [paths[0], paths[1], paths[2], paths[1], paths[0]])
+
+    def test_cold_load_does_not_block_other_inputs(self):
+        loads = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def load(path):
+            loads.append(path)
+            if path.endswith("slow.csv"):
+                started.set()
+                release.wait(5)
+            return path
+
+        with tempfile.TemporaryDirectory() as tmp:
+            slow, fast = (os.path.join(tmp, name) for name in ("slow.csv", "fast.csv"))
+            for path in (slow, fast):
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write("case_id,attr_type\n")
+            cache = EventCache(load)
+            cache.get(fast)
+
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(cache.get(slow))) for _ in range(2)
+            ]
+            for thread in threads:
+                thread.start()
+            self.assertTrue(started.wait(5))
+            # 読込中の入力があっても、キャッシュ済みの別入力はすぐ返る
+            fast_results = []
+            reader = threading.Thread(target=lambda: fast_results.append(cache.get(fast)))
+            reader.start()
+            reader.join(1)
+            self.assertEqual(fast_results, [fast])
+            release.set()
+            for thread in threads:
+                thread.join(5)
+
+        self.assertEqual(results, [slow, slow])
+        self.assertEqual(loads, [fast, slow])
+
+    def test_failed_load_is_reported_to_waiters_and_retried(self):
+        calls = []
+
+        def load(path):
+            calls.append(path)
+            if len(calls) == 1:
+                raise UserInputError("broken")
+            return path
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "a.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("case_id,attr_type\n")
+            cache = EventCache(load)
+            with self.assertRaises(UserInputError):
+                cache.get(path)
+            self.assertEqual(cache.get(path), path)
+        self.assertEqual(calls, [path, path])
+
+
+class TestPortalServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.config = load_config()
+        cls.server = start_portal_server(PortalService(cls.config), port=0)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def fetch(self, path):
+        with urlopen(self.base + path) as res:
+            return res.read().decode("utf-8")
+
+    def test_page_links_switch_inputs(self):
+        alt = self.config["display"]["input_candidates"][1]
+        html = self.fetch("/?input=" + quote(alt))
+        self.assertIn('data-navigate="1"', html)
+        self.assertIn(f"value='/?input={quote(alt)}' selected", html)
+        self.assertIn('href="/assets/style.css"', html)
+
+    def test_table_api_returns_rows(self):
+        data = json.loads(self.fetch("/api/table"))
+        self.assertEqual(len(data["rows"]), 7)
+        self.assertIn("labels", data)
+
+    def test_unknown_input_is_rejected(self):
+        with self.assertRaises(HTTPError) as ctx:
+            self.fetch("/api/table?input=" + quote("/etc/passwd"))
+        self.assertEqual(ctx.exception.code, 404)
+        ctx.exception.close()
+
+
+class TestPrecompressedAssets(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.server, _ = start_server(self.tmp.name, port=0)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.path = os.path.join(self.tmp.name, "events.js")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("window.PORTAL_DATA = {};\n" * 100)
+
+    def fetch(self, encoding):
+        request = Request(self.base + "/events.js", headers={"Accept-Encoding": encoding})
+        with urlopen(request) as res:
+            return res.headers.get("Content-Encoding"), res.read()
+
+    def test_gzip_sibling_is_served_when_accepted(self):
+        compress_file(self.path, "gzip")
+        with open(self.path, "rb") as f:
+            raw = f.read()
+
+        encoding, body = self.fetch("gzip, deflate")
+        self.assertEqual(encoding, "gzip")
+        self.assertEqual(gzip.decompress(body), raw)
+
+        encoding, body = self.fetch("identity")
+        self.assertIsNone(encoding)
+        self.assertEqual(body, raw)
+
+    def test_stale_sibling_is_ignored(self):
+        compress_file(self.path, "gzip")
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("// changed\n")
+        os.utime(self.path, ns=(0, os.stat(self.path).st_mtime_ns + 1))
+
+        encoding, body = self.fetch("gzip")
+        self.assertIsNone(encoding)
+        self.assertTrue(body.endswith(b"// changed\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.config_manager import ConfigManager
+from src.utils.errors import UserInputError
+
+
+# キャッシュ済みの再実行で読み込まないはずのモジュール
+LAZY_MODULES = (
+    "yaml",
+    "webbrowser",
+    "http.server",
+    "multiprocessing",
+    "concurrent.futures",
+    "sqlite3",
+    "src.batch",
+    "src.server",
+    "src.watcher",
+    "src.handlers.parallel_loader",
+    "src.handlers.event_store",
+    "src.handlers.event_differ",
+    "src.handlers.portal_renderer",
+    "src.utils.compress",
+)
+STARTUP_BUDGET_SEC = 1.0
+
+
+class TestConfigCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.config_path = os.path.join(self.tmp.name, "main.yaml")
+        shutil.copy(os.path.join(ROOT_DIR, "config", "main.yaml"), self.config_path)
+        self.cache_dir = os.path.join(self.tmp.name, "cache")
+
+    def load(self):
+        return ConfigManager(self.config_path, self.cache_dir).load()
+
+    def test_cached_config_skips_yaml(self):
+        expected = ConfigManager(self.config_path).load()
+        self.assertEqual(self.load(), expected)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+        with mock.patch.object(ConfigManager, "_load_yaml", side_effect=AssertionError):
+            self.assertEqual(self.load(), expected)
+            # 更新時刻だけ変わった場合は内容ハッシュで一致を確認して再利用する
+            stat = os.stat(self.config_path)
+            os.utime(self.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            self.assertEqual(self.load(), expected)
+
+    def test_edited_config_is_reloaded_and_validated(self):
+        self.load()
+        with open(self.config_path, "a", encoding="utf-8") as f:
+            f.write("\nstore:\n  enabled: true\n")
+        self.assertTrue(self.load()["store"]["enabled"])
+
+        with open(self.config_path, "a", encoding="utf-8") as f:
+            f.write("\noutput:\n  compress: [zip]\n")
+        with self.assertRaises(UserInputError):
+            self.load()
+        with self.assertRaises(UserInputError):
+            self.load()
+
+
+class TestStartupBudget(unittest.TestCase):
+    def run_cli(self, cwd, output_dir):
+        command = [
+            sys.executable,
+            "-X",
+            "importtime",
+            os.path.join(ROOT_DIR, "src", "main.py"),
+            "--config",
+            os.path.join(ROOT_DIR, "config", "main.yaml"),
+            "--input",
+            os.path.join(ROOT_DIR, "data", "input", "data_flow_dummy.csv"),
+            "--output",
+            output_dir,
+        ]
+        started = time.perf_counter()
+        result = subprocess.run(command, cwd=cwd, capture_output=True, text=True, encoding="utf-8")
+        elapsed = time.perf_counter() - started
+        self.assertEqual(result.returncode, 0, result.stderr)
+        modules = {
+            line.rsplit("|", 1)[1].strip()
+            for line in result.stderr.splitlines()
+            if line.startswith("import time:")
+        }
+        return elapsed, modules, result.stderr
+
+    def test_unchanged_rebuild_stays_lean(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output_dir = os.path.join(tmp, "portal")
+            self.run_cli(tmp, output_dir)
+            started = time.perf_counter()
+            subprocess.run([sys.executable, "-c", "pass"], check=True)
+            baseline = time.perf_counter() - started
+            elapsed, modules, stderr = self.run_cli(tmp, output_dir)
+
+        self.assertIn("no changes, skipped", stderr)
+        self.assertEqual(sorted(modules & set(LAZY_MODULES)), [])
+        self.assertLess(elapsed - baseline, STARTUP_BUDGET_SEC)
+
+
+if __name__ == "__main__":
+    unittest.main()
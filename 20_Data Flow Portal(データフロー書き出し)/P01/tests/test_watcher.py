@@ -0,0 +1,100 @@
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.config_manager import ConfigManager
+from src.pipeline import build_portal
+from src.server import ReloadState, inject_reload_script
+from src.watcher import PortalWatcher
+
+
+class TestPortalWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.input_csv = os.path.join(self.tmp, "input.csv")
+        shutil.copy(
+            os.path.join(ROOT_DIR, "data", "input", "data_flow_dummy.csv"), self.input_csv
+        )
+        self.display = {}
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def load_config(self):
+        config = ConfigManager(os.path.join(ROOT_DIR, "config", "main.yaml")).load()
+        config["paths"]["input_csv"] = self.input_csv
+        config["paths"]["output_dir"] = os.path.join(self.tmp, "out")
+        config["paths"]["assets_dir"] = os.path.join(self.tmp, "out", "assets")
+        config["display"].update(self.display)
+        return config
+
+    def test_display_change_reuses_events(self):
+        reload_state = ReloadState()
+        watcher = PortalWatcher(
+            os.path.join(ROOT_DIR, "config", "main.yaml"),
+            self.load_config,
+            logging.getLogger("test_watcher"),
+            reload_state,
+        )
+        watcher.rebuild_safely()
+        events = watcher.events
+
+        self.display["show_legend"] = False
+        watcher.rebuild_safely()
+        self.assertIs(watcher.events, events)
+
+        with open(self.input_csv, "a", encoding="utf-8") as f:
+            f.write("CASE-999,orders,INSERT,trg,status,NULL,NEW,,INSERT\n")
+        self.assertTrue(watcher.poll())
+        watcher.rebuild_safely()
+        self.assertIsNot(watcher.events, events)
+        self.assertEqual(len(watcher.events), len(events) + 1)
+        self.assertFalse(watcher.poll())
+        self.assertEqual(reload_state.version, 3)
+
+    def test_input_error_keeps_watching(self):
+        watcher = PortalWatcher(
+            os.path.join(ROOT_DIR, "config", "main.yaml"),
+            self.load_config,
+            logging.getLogger("test_watcher"),
+        )
+        with open(self.input_csv, "w", encoding="utf-8") as f:
+            f.write("table,attr_type\norders,status\n")
+        self.assertIsNone(watcher.rebuild_safely())
+        self.assertIn(self.input_csv, watcher.watched)
+
+    def test_normal_build_after_watch_is_not_skipped(self):
+        logger = logging.getLogger("test_watcher")
+        index_path = build_portal(self.load_config(), logger)
+        with open(self.input_csv, "r", encoding="utf-8", newline="") as f:
+            original = f.read()
+
+        with open(self.input_csv, "a", encoding="utf-8") as f:
+            f.write("CASE-999,orders,INSERT,trg,status,NULL,NEW,,INSERT\n")
+        PortalWatcher(os.path.join(ROOT_DIR, "config", "main.yaml"), self.load_config, logger).build()
+        with open(index_path, "r", encoding="utf-8") as f:
+            self.assertIn("CASE-999", f.read())
+
+        with open(self.input_csv, "w", encoding="utf-8", newline="") as f:
+            f.write(original)
+        build_portal(self.load_config(), logger)
+        with open(index_path, "r", encoding="utf-8") as f:
+            self.assertNotIn("CASE-999", f.read())
+
+
+class TestReloadScript(unittest.TestCase):
+    def test_script_is_injected_before_body_end(self):
+        html = inject_reload_script("<html><body><p>x</p></body></html>")
+        self.assertIn("/__reload", html)
+        self.assertTrue(html.endswith("</body></html>"))
+
+
+if __name__ == "__main__":
+    unittest.main()